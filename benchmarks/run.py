@@ -0,0 +1,242 @@
+import argparse
+import gc
+import json
+from pathlib import Path
+import platform
+import random
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from wrdllib import feedback  # noqa: E402
+from wrdllib.dictionary import WrdlDictionary  # noqa: E402
+from wrdllib.guesses import GuessChecker  # noqa: E402
+from wrdllib.lexicon import LexiconStore  # noqa: E402
+from wrdllib.simulation import simulate  # noqa: E402
+
+BASELINE_PATH = Path(__file__).parent.joinpath("baseline.json")
+BENCHMARKS = dict()
+
+
+def benchmark(name):
+    def register(function):
+        BENCHMARKS[name] = function
+        return function
+
+    return register
+
+
+def measure(function, repeat=5, minimum_time=0.05):
+    # Best per-call time over several rounds, each long enough to swamp timer noise.
+    # The untimed first call pays for lazily built lexicon codes and caches.
+    function()
+    best = float("inf")
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            calls, started = 0, time.perf_counter()
+            while True:
+                function()
+                calls += 1
+                elapsed = time.perf_counter() - started
+                if elapsed >= minimum_time:
+                    break
+            best = min(best, elapsed / calls)
+    finally:
+        if enabled:
+            gc.enable()
+    return best
+
+
+def played(length, secret, guesses):
+    checker = GuessChecker(length, secret)
+    for guess in guesses:
+        checker.validate(guess)
+    return checker
+
+
+@benchmark("dictionary.load.text")
+def dictionary_load_text():
+    return {"": measure(lambda: LexiconStore(compiled_path=None).buckets, repeat=3)}
+
+
+@benchmark("dictionary.load.compiled")
+def dictionary_load_compiled():
+    return {"": measure(lambda: LexiconStore().buckets, repeat=3)}
+
+
+@benchmark("dictionary.init")
+def dictionary_init():
+    return {
+        str(length): measure(lambda: WrdlDictionary(length)) for length in range(2, 16)
+    }
+
+
+@benchmark("dictionary.validate")
+def dictionary_validate():
+    dictionary = WrdlDictionary(5)
+    words = random.Random(0).sample(tuple(dictionary.lexicon), 100)
+    return {"": measure(lambda: [dictionary.validate(word) for word in words]) / 100}
+
+
+@benchmark("solver.plausible_words")
+def solver_plausible_words():
+    results = dict()
+    for label, guesses in (
+        ("full", ()),
+        ("one_guess", ("THROW",)),
+        ("two_guesses", ("THROW", "OZONE")),
+    ):
+        checker = played(5, "BLOOM", guesses)
+        solver = checker.auto_solver
+
+        def plausible_words():
+            solver.reset()
+            for guess, evaluations in zip(checker.valid_guesses, checker.evaluations):
+                solver.observe(guess, evaluations)
+            solver.get_plausible_words(checker.guessed_letters)
+
+        results[label] = measure(plausible_words)
+    return results
+
+
+@benchmark("solver.best_guess")
+def solver_best_guess():
+    results = dict()
+    for label, guesses in (("full", ()), ("one_guess", ("THROW",))):
+        checker = played(5, "BLOOM", guesses)
+        guessed_letters = checker.guessed_letters
+        results[label] = measure(
+            lambda: checker.auto_solver.generate_guess(
+                guessed_letters, best_guess=True, random_guess=False
+            )
+        )
+    return results
+
+
+@benchmark("solver.grade_guess")
+def solver_grade_guess():
+    solver = GuessChecker(5).auto_solver
+    words = tuple(solver.dictionary.lexicon)[:1000]
+    return {"": measure(lambda: [solver.grade_guess(word) for word in words]) / 1000}
+
+
+@benchmark("checker.evaluate")
+def checker_evaluate():
+    checker = GuessChecker(5, "EERIE")
+    words = ("THERE", "GEESE", "ERASE", "CHEAT", "LLAMA")
+
+    def evaluate():
+        checker.reset("EERIE")
+        for word in words:
+            checker.validate(word)
+            checker.evaluate()
+
+    return {
+        "": measure(evaluate) / len(words),
+        "score": measure(lambda: [feedback.score(word, "EERIE") for word in words])
+        / len(words),
+    }
+
+
+@benchmark("feedback.batch")
+def feedback_batch():
+    secrets = tuple(WrdlDictionary(5).lexicon)
+    return {
+        guess: measure(lambda: feedback.score_many(guess, secrets)) / len(secrets)
+        for guess in ("CRANE", "EERIE")
+    }
+
+
+@benchmark("query")
+def word_queries():
+    from wrdllib.word_index import WordIndex
+
+    index = WordIndex()
+    index.index(5)
+    return {
+        "pattern": measure(lambda: index.match("C?A?T", "E", "S")),
+        "include": measure(lambda: index.match("?????", "EE", "S")),
+        "anagram": measure(lambda: index.anagrams("LEAST")),
+    }
+
+
+@benchmark("games.headless")
+def games_headless():
+    return {
+        str(length): measure(
+            lambda: simulate(length=length, games=10, workers=1, seed=0)
+        )
+        / 10
+        for length in (4, 5, 8)
+    }
+
+
+def run(selected=None):
+    results = dict()
+    for name, function in BENCHMARKS.items():
+        if selected and not any(name.startswith(prefix) for prefix in selected):
+            continue
+        for case, seconds in function().items():
+            results[f"{name}[{case}]" if case else name] = seconds
+    return results
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, seconds in sorted(results.items()):
+        expected = baseline.get(name)
+        if expected is None:
+            status = "new"
+        elif seconds > expected * (1 + tolerance):
+            status = "REGRESSION"
+            regressions.append(name)
+        elif seconds < expected / (1 + tolerance):
+            status = "faster"
+        else:
+            status = "ok"
+        ratio = f"{seconds / expected:6.2f}x" if expected else " " * 7
+        print(f"{status:>10}  {ratio}  {seconds * 1e6:12.2f}us  {name}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Time Wrdl's hot paths and compare them to a stored baseline."
+    )
+    parser.add_argument(
+        "benchmarks", nargs="*", help="only run names with these prefixes"
+    )
+    parser.add_argument("-b", "--baseline", default=BASELINE_PATH)
+    parser.add_argument("-o", "--output", default=None, help="write results as JSON")
+    parser.add_argument("-t", "--tolerance", default=0.5)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    results = run(args.benchmarks)
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(
+            json.dumps(report, indent=2, sort_keys=True) + "\n"
+        )
+    if args.save_baseline:
+        Path(args.baseline).write_text(
+            json.dumps(report, indent=2, sort_keys=True) + "\n"
+        )
+        print(f"Saved {len(results)} timings to {args.baseline}")
+        raise SystemExit()
+
+    try:
+        baseline = json.loads(Path(args.baseline).read_text())["results"]
+    except FileNotFoundError:
+        baseline = dict()
+    regressions = compare(results, baseline, float(args.tolerance))
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed beyond the tolerance.")
+        raise SystemExit(1)
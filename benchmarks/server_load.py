@@ -0,0 +1,86 @@
+import argparse
+import asyncio
+import json
+from pathlib import Path
+import statistics
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from wrdllib.server import WrdlServer  # noqa: E402
+
+
+async def request(reader, writer, latencies, **payload):
+    started = time.perf_counter()
+    writer.write(json.dumps(payload).encode() + b"\n")
+    await writer.drain()
+    response = json.loads(await reader.readline())
+    latencies.append(time.perf_counter() - started)
+    return response
+
+
+async def client(host, port, games, length, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    for _ in range(games):
+        session = (await request(reader, writer, latencies, op="new", length=length))[
+            "session"
+        ]
+        for _ in range(6):
+            hint = await request(reader, writer, latencies, op="hint", session=session)
+            board = await request(
+                reader,
+                writer,
+                latencies,
+                op="guess",
+                session=session,
+                word=hint["guess"],
+            )
+            await request(reader, writer, latencies, op="keyboard", session=session)
+            if board.get("solved"):
+                break
+        await request(reader, writer, latencies, op="close", session=session)
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run(host, port, clients, games, length):
+    server = None
+    if host is None:
+        host = "127.0.0.1"
+        server = await WrdlServer().start(host, 0)
+        port = server.sockets[0].getsockname()[1]
+
+    latencies = []
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(client(host, port, games, length, latencies) for _ in range(clients))
+    )
+    elapsed = time.perf_counter() - started
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+
+    latencies.sort()
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"{len(latencies)} requests from {clients} clients in {elapsed:.2f}s")
+    print(f"Throughput: {len(latencies) / elapsed:.1f} requests/s")
+    print(f"p50: {quantiles[49] * 1000:.2f}ms")
+    print(f"p99: {quantiles[98] * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Drive a Wrdl server with concurrent clients playing hinted games."
+    )
+    parser.add_argument("--connect", default=None, help="host:port of a running server")
+    parser.add_argument("-c", "--clients", default=50)
+    parser.add_argument("-g", "--games", default=10)
+    parser.add_argument("-l", "--word-length", default=5)
+    args = parser.parse_args()
+    host, port = None, None
+    if args.connect:
+        host, port = args.connect.rsplit(":", 1)
+    asyncio.run(
+        run(host, port, int(args.clients), int(args.games), int(args.word_length))
+    )
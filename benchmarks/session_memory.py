@@ -0,0 +1,66 @@
+import argparse
+from pathlib import Path
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from wrdllib import feedback  # noqa: E402
+from wrdllib.dictionary import WrdlDictionary  # noqa: E402
+from wrdllib.guesses import GuessChecker  # noqa: E402
+from wrdllib.session import GameSession  # noqa: E402
+
+
+def clear_caches():
+    # The scoring caches are shared by every game in the process, so they are
+    # emptied around each measurement to leave only what the sessions hold.
+    feedback.decode.cache_clear()
+    feedback.plan.cache_clear()
+
+
+def bytes_per_session(factory, play, count, guesses):
+    tracemalloc.start()
+    clear_caches()
+    before = tracemalloc.take_snapshot()
+    sessions = [factory() for _ in range(count)]
+    for session, words in zip(sessions, guesses):
+        for word in words:
+            play(session, word)
+    clear_caches()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return allocated / count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure the memory held per live Wrdl game session."
+    )
+    parser.add_argument("-l", "--word-length", default=5)
+    parser.add_argument("-g", "--guesses", default=3)
+    parser.add_argument("-c", "--counts", default="10000,100000")
+    parser.add_argument("--checker-count", default=1000)
+    args = parser.parse_args()
+
+    dictionary = WrdlDictionary(int(args.word_length))
+    dictionary.lexicon.members
+    chooser = random.Random(0)
+    for count in map(int, args.counts.split(",")):
+        guesses = [
+            chooser.sample(dictionary.lexicon, int(args.guesses)) for _ in range(count)
+        ]
+        size = bytes_per_session(
+            lambda: GameSession(dictionary), GameSession.guess, count, guesses
+        )
+        print(f"GameSession x {count}: {size:.0f} bytes/session")
+
+    count = int(args.checker_count)
+    guesses = [
+        chooser.sample(dictionary.lexicon, int(args.guesses)) for _ in range(count)
+    ]
+    size = bytes_per_session(
+        lambda: GuessChecker(dictionary.length), GuessChecker.validate, count, guesses
+    )
+    print(f"GuessChecker x {count}: {size:.0f} bytes/session")
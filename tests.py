@@ -1,14 +1,70 @@
+import asyncio
+import collections
+import gzip
+import json
+import math
+import mmap
 import string
+import time
+
 import pytest
 
+from wrdllib import feedback, instrumentation
+from wrdllib.compiled import (
+    COMPILED_PATH,
+    CompiledDictionaryError,
+    checksum,
+    load_sections,
+    read_manifest,
+    read_sections,
+)
+from wrdllib.decision_tree import DecisionTree, build_tree
+from wrdllib.dictionary import WrdlDictionary
+from wrdllib.evaluator import evaluate_strategy, save_report
+from wrdllib.guesses import STRATEGIES, GuessChecker, WrdlSolver
+from wrdllib.lexicon import LexiconStore
+from wrdllib.multiboard import MultiBoardChecker, play_game
+from wrdllib.server import WrdlServer
+from wrdllib.session import GameSession
+from wrdllib.simulation import simulate
+from wrdllib.solver_cache import SolverCache
+from wrdllib.spelling_bee import SpellingBeeIndex, is_pangram
+from wrdllib.stats import StatsStore
+from wrdllib.word_index import WordIndex, match
 from wrdllib.wrdl import Wrdl
 from wrdllib.exceptions import (
     AlreadyGuessed,
+    HardModeViolation,
     InvalidGuess,
     InvalidGuessChars,
+    MismatchedDecisionTree,
+    NoSuchDictionary,
 )
 
 
+def reference_evaluation(guess, secret):
+    evaluations = [None] * len(guess)
+    guessed_letter_counts = collections.defaultdict(int)
+    letter_counts = collections.Counter(secret)
+    for position, letter in enumerate(guess):
+        if secret[position] == letter:
+            evaluations[position] = 1
+        elif letter not in secret:
+            evaluations[position] = 0
+        else:
+            continue
+        guessed_letter_counts[letter] += evaluations[position]
+    for position, evaluation in enumerate(evaluations):
+        if evaluation is None:
+            letter = guess[position]
+            if guessed_letter_counts[letter] >= letter_counts[letter]:
+                evaluations[position] = 0
+            else:
+                evaluations[position] = -1
+            guessed_letter_counts[letter] += 1
+    return tuple(evaluations)
+
+
 def test_wrdl_setup():
     wordle = Wrdl(blind=True)  # word length 5, six guesses, random answer
     assert wordle.auto_solver.dictionary.length == 5
@@ -129,3 +185,706 @@ def test_auto_solver():
     assert (
         len(wordle.auto_solver.get_plausible_words(wordle.checker.guessed_letters)) > 0
     )
+
+
+def test_shared_lexicon():
+    first, second = WrdlDictionary(5), WrdlDictionary(5)
+    assert first.lexicon is second.lexicon
+    assert first.letter_counts is second.letter_counts
+    assert "CHEAT" in first.lexicon and "CHEAT" in first.lexicon.members
+    assert first.lexicon[first.lexicon.index("CHEAT")] == "CHEAT"
+    assert list(first.lexicon) == sorted(first.lexicon)
+    assert first.validate(" cheat\n") == "CHEAT"
+    assert first.validate("QQQQQ", fail_silently=True) is None
+    with pytest.raises(NoSuchDictionary):
+        WrdlDictionary(16)
+
+
+def test_compiled_dictionary(tmp_path):
+    source, target = tmp_path / "words.txt", tmp_path / "words.bin"
+    source.write_text("cheat\nAB\nlemon\nab\nno1se\nQUIZ\n")
+    sections = load_sections(source, target)
+    assert list(sections[5]) == ["CHEAT", "LEMON"]
+    assert sections[5][-1] == "LEMON" and "CHEAT" in sections[5]
+    assert list(sections[2]) == ["AB"] and 3 not in sections
+
+    source.write_bytes("café\nnaïve\ncrane\n".encode() + b"br\xe9ve\n")
+    sections = load_sections(source, target)
+    assert sorted(sections) == [5] and list(sections[5]) == ["CRANE"]
+
+    source.write_text("cheat\nbrine\n")
+    with pytest.raises(CompiledDictionaryError):
+        read_sections(target, checksum(source))
+    assert list(load_sections(source, target)[5]) == ["BRINE", "CHEAT"]
+    assert read_manifest(source, target) == {5: 2}
+    assert LexiconStore(source, target).count(5) == 2
+    assert LexiconStore(source, target).count(4) == 0
+
+    store = LexiconStore(source, compiled_path=None)
+    assert list(store[5]) == ["BRINE", "CHEAT"] and len(store[4]) == 0
+
+
+def test_numpy_engine_matches_python():
+    pytest.importorskip("numpy")
+    for length, secret, guesses in (
+        (5, "BLOOM", ("THROW", "OZONE")),
+        (5, "SPILT", ("THICK",)),
+        (8, "SEASONED", ("REASONED", "PERSONAL")),
+    ):
+        checkers = [
+            GuessChecker(length, secret, engine=engine)
+            for engine in ("python", "numpy")
+        ]
+        for guess in guesses:
+            for checker in checkers:
+                checker.validate(guess)
+                list(checker.evaluate())
+            python_words, numpy_words = (
+                checker.auto_solver.get_plausible_words(checker.guessed_letters)
+                for checker in checkers
+            )
+            assert secret in python_words
+            assert python_words == numpy_words
+
+
+def test_feedback_table(tmp_path):
+    words = (
+        "ABIDE", "ALLAY", "BLOOM", "CHEAT", "EERIE", "ERASE", "GEESE", "LLAMA",
+        "OZONE", "SPEED", "SPILT", "THERE", "THICK", "THROW",
+    )  # fmt: skip
+    checker = GuessChecker(5)
+    assert feedback.decode(feedback.encode((1, -1, 0, 0, 1)), 5) == (1, -1, 0, 0, 1)
+    for vectorized in (False, True):
+        if vectorized:
+            pytest.importorskip("numpy")
+        table = feedback.build_table(5, words, vectorized=vectorized, chunk_size=5)
+        for guess in words:
+            for answer in words:
+                checker.reset(answer)
+                checker.validate(guess)
+                evaluations = tuple(checker.evaluate())
+                assert evaluations == reference_evaluation(guess, answer)
+                assert table.evaluations(guess, answer) == evaluations
+                assert feedback.score(guess, answer) == feedback.encode(evaluations)
+        assert table.pattern("CHEAT", "CHEAT") == feedback.solved_pattern(5)
+
+    cached = feedback.load_table(5, words[:4], words, cache_dir=tmp_path)
+    assert not isinstance(cached.patterns.obj, mmap.mmap)
+    cached = feedback.load_table(5, words[:4], words, cache_dir=tmp_path)
+    assert isinstance(cached.patterns.obj, mmap.mmap)
+    assert list(cached.row("BLOOM")) == [feedback.score("BLOOM", w) for w in words]
+
+    checker = GuessChecker(5, "EERIE", feedback_table=cached)
+    checker.validate("ABIDE")
+    assert tuple(checker.evaluate()) == cached.evaluations("ABIDE", "EERIE")
+
+
+def test_entropy_guess():
+    def entropy(guess, candidates):
+        buckets = collections.Counter(feedback.score(guess, c) for c in candidates)
+        return -sum(
+            count / len(candidates) * math.log2(count / len(candidates))
+            for count in buckets.values()
+        )
+
+    wordle = Wrdl(force_starting_word="BLOOM", blind=True, strategy="entropy")
+    wordle.enter_guess("THROW")
+    solver = wordle.auto_solver
+    candidates = solver.get_plausible_words(wordle.checker.guessed_letters)
+    guess = solver.most_informative_guess(candidates, time_budget=None)
+    assert guess in candidates
+    assert entropy(guess, candidates) == max(entropy(c, candidates) for c in candidates)
+    assert solver.most_informative_guess(candidates, node_budget=1) in candidates
+
+    wordle.auto_guess(best_guess=False, entropy_guess=True)
+    assert len(wordle.checker.valid_guesses) == 2
+    with pytest.raises(ValueError):
+        solver.generate_guess(wordle.checker.guessed_letters, entropy_guess=True)
+    with pytest.raises(ValueError):
+        Wrdl(blind=True, strategy="psychic")
+
+
+def test_incremental_candidates():
+    checker = GuessChecker(5, "BLOOM")
+    solver = checker.auto_solver
+    assert len(solver.get_plausible_words(checker.guessed_letters)) == len(
+        solver.dictionary.lexicon
+    )
+    for guess in ("THROW", "OZONE"):
+        checker.validate(guess)
+        list(checker.evaluate())
+        narrowed = solver.get_plausible_words(checker.guessed_letters)
+        assert narrowed == solver.engine.words(
+            solver.engine.filter(
+                solver.model,
+                "".join(k for k, v in checker.guessed_letters.items() if v == -1),
+            )
+        )
+        assert "BLOOM" in narrowed
+        assert solver.get_plausible_words(checker.guessed_letters) is narrowed
+
+    checker.reset("CHEAT")
+    assert solver.read_from_model(0) == string.ascii_uppercase
+    assert len(solver.get_plausible_words(checker.guessed_letters)) == len(
+        solver.dictionary.lexicon
+    )
+
+
+def test_headless_simulation():
+    report = simulate(length=4, games=6, workers=1, seed=3)
+    assert report.games == 6
+    assert report.failures + sum(report.distribution.values()) == 6
+    assert 0 <= report.win_rate <= 1 and report.games_per_second > 0
+    assert simulate(length=4, games=6, workers=2, seed=3).distribution == (
+        report.distribution
+    )
+    assert simulate(secrets=("CHEAT",), workers=1).games == 1
+
+
+def test_simulation_options(tmp_path):
+    source = tmp_path / "words.txt"
+    source.write_text("cigar\nrebut\nsissy\nhumph\nawake\nblush\nfocal\n")
+    store = LexiconStore(source)
+    for workers in (1, 2):
+        report = simulate(
+            all_answers=True,
+            workers=workers,
+            store=store,
+            hard_mode=True,
+            probe_words=True,
+        )
+        assert report.games == 7 and report.wins == 7
+    with pytest.raises(MismatchedDecisionTree):
+        simulate(secrets=("CHEAT",), workers=1, decision_tree=build_tree(3))
+
+
+def test_decision_tree(tmp_path):
+    tree = build_tree(3, checkpoint_dir=tmp_path)
+    path = tree.save(tmp_path / "tree.json.gz")
+    loaded = DecisionTree.load(path)
+    assert loaded.root.to_json() == tree.root.to_json()
+    assert len(loaded.root) == len(tree.root)
+
+    checkpoints = sorted(tmp_path.glob("3-best-*/*.json.gz"))
+    assert len(checkpoints) == len(tree.root.children)
+    checkpoints[0].unlink()
+    resumed = build_tree(3, checkpoint_dir=tmp_path, workers=2)
+    assert resumed.root.to_json() == tree.root.to_json()
+
+    checker = GuessChecker(3, "ZAP")
+    checker.auto_solver.decision_tree = loaded
+    for _ in range(loaded.root.depth()):
+        guess = checker.auto_solver.generate_guess(
+            checker.guessed_letters, best_guess=True, random_guess=False
+        )
+        assert guess == loaded.follow(checker.auto_solver.history).guess
+        checker.validate(guess)
+        if sum(checker.evaluate()) == 3:
+            break
+    assert checker.valid_guesses[-1] == "ZAP"
+
+    checker.reset("ZAP")
+    checker.validate("AAH")
+    list(checker.evaluate())
+    assert loaded.follow(checker.auto_solver.history) is None
+    assert checker.auto_solver.generate_guess(
+        checker.guessed_letters, best_guess=True, random_guess=False
+    )
+
+    # A tree is only followed in its own mode, and only for its own answers.
+    checker.reset("ZAP")
+    assert checker.auto_solver.generate_guess(
+        checker.guessed_letters, entropy_guess=True, random_guess=False
+    ) == checker.auto_solver.most_informative_guess(
+        checker.auto_solver.get_plausible_words(dict())
+    )
+    with pytest.raises(MismatchedDecisionTree):
+        WrdlSolver(4, decision_tree=loaded)
+    source = tmp_path / "words.txt"
+    source.write_text("zap\nzip\nzoo\n")
+    with pytest.raises(MismatchedDecisionTree):
+        WrdlSolver(3, decision_tree=loaded, store=LexiconStore(source))
+
+
+def test_evaluations_are_stored():
+    wordle = Wrdl(force_starting_word="BLOOM", blind=True)
+    wordle.enter_guess("OZONE")
+    evaluations = wordle.checker.evaluate()
+    assert evaluations == (-1, 0, 1, 0, 0)
+    assert wordle.checker.evaluate(0) is evaluations
+    assert not wordle.solved and not wordle.solved
+    assert wordle.checker.evaluations == (evaluations,)
+    assert wordle.auto_solver.history == (("OZONE", feedback.encode(evaluations)),)
+    wordle.enter_guess("BLOOM")
+    assert wordle.solved
+    assert len(wordle.auto_solver.history) == 2
+
+
+def test_constraint_model_duplicates():
+    checker = GuessChecker(5, "THERE")
+    checker.validate("EERIE")
+    assert checker.evaluate() == (-1, 0, -1, 0, 1)
+    model = checker.auto_solver.model
+    assert model.minimums["E"] == 2 and model.maximums["E"] == 2
+    assert model.maximums["I"] == 0 and "I" not in checker.auto_solver.read_from_model(
+        0
+    )
+    assert checker.auto_solver.read_from_model(4) == "E"
+    assert "E" in checker.auto_solver.read_from_model(2)
+    assert "E" not in checker.auto_solver.read_from_model(1)
+    words = checker.auto_solver.get_plausible_words(checker.guessed_letters)
+    assert "THERE" in words
+    assert all(word.count("E") == 2 and model.admits(word) for word in words)
+
+    for secret in ("BLOOM", "GEESE", "LLAMA", "SPEED"):
+        for guess in ("OZONE", "EERIE", "ALLAY", "ERASE", "LEVEL"):
+            checker.reset(secret)
+            checker.validate(guess)
+            assert secret in checker.auto_solver.get_plausible_words(
+                checker.guessed_letters
+            )
+
+
+def test_game_server():
+    async def exchange(**payload):
+        writer.write(json.dumps(payload).encode() + b"\n")
+        await writer.drain()
+        return json.loads(await reader.readline())
+
+    async def play():
+        nonlocal reader, writer
+        server = await wrdl_server.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        new = await exchange(op="new", secret="BLOOM", max_guesses=2, id=7)
+        assert new["ok"] and new["id"] == 7 and new["length"] == 5
+        session = new["session"]
+        assert (await exchange(op="guess", session=session, word="QQQQQ"))[
+            "error"
+        ] == "Unrecognized word."
+        board = await exchange(op="guess", session=session, word="OZONE")
+        assert board["evaluations"] == [[-1, 0, 1, 0, 0]] and not board["solved"]
+        keyboard = await exchange(op="keyboard", session=session)
+        assert keyboard["letters"]["Z"] == 0
+        hint = await exchange(op="hint", session=session)
+        assert hint["ok"] and hint["candidates"] >= 1
+        board = await exchange(op="guess", session=session, word="BLOOM")
+        assert board["solved"] and board["guesses_left"] == 0
+        assert not (await exchange(op="guess", session=session, word="CHEAT"))["ok"]
+        assert not (await exchange(op="dance"))["ok"]
+        for request, error in (
+            ({"length": None}, "Field 'length' must be an integer."),
+            ({"length": [5]}, "Field 'length' must be an integer."),
+            ({"max_guesses": "6"}, "Field 'max_guesses' must be an integer."),
+            ({"secret": 5}, "Field 'secret' must be a string."),
+        ):
+            assert await exchange(op="new", **request) == {"ok": False, "error": error}
+        fresh = (await exchange(op="new"))["session"]
+        assert (await exchange(op="guess", session=fresh))["error"] == (
+            "Missing field 'word'."
+        )
+        assert (await exchange(op="guess", session=fresh, word=None))["error"] == (
+            "Field 'word' must be a string."
+        )
+        await exchange(op="close", session=fresh)
+        writer.close()
+        server.close()
+        await server.wait_closed()
+
+    reader = writer = None
+    wrdl_server = WrdlServer(idle_timeout=60)
+    asyncio.run(play())
+    assert len(wrdl_server.sessions) == 1
+    assert wrdl_server.evict_idle(now=time.monotonic() + 61) == 1
+    assert not wrdl_server.sessions
+
+
+def test_game_session():
+    dictionary = WrdlDictionary(5)
+    session = GameSession(dictionary, "bloom")
+    assert session.secret_word == "BLOOM" and not hasattr(session, "__dict__")
+    session.guess("ozone")
+    with pytest.raises(AlreadyGuessed):
+        session.guess("OZONE")
+    with pytest.raises(InvalidGuess):
+        session.guess("QQQQQ")
+    assert session.valid_guesses == ("OZONE",)
+    assert session.evaluations == ((-1, 0, 1, 0, 0),)
+    assert session.guessed_letters["O"] == 1 and session.guessed_letters["Z"] == 0
+    assert session.constraints().admits("BLOOM")
+    assert not session.constraints().admits("OZONE")
+    session.guess("BLOOM")
+    assert session.solved
+
+    checker = GuessChecker(5, "BLOOM")
+    checker.validate("OZONE")
+    assert checker.session.patterns == (feedback.score("OZONE", "BLOOM"),)
+    assert checker.guessed_letters == {"O": 1, "Z": 0, "N": 0, "E": 0}
+
+
+def test_instrumentation(tmp_path):
+    validate = WrdlDictionary.validate
+    instrumentation.reset()
+    with instrumentation.profiling(tmp_path / "wrdl.prof") as stats:
+        assert WrdlDictionary.validate is not validate
+        checker = GuessChecker(5, "BLOOM")
+        checker.validate("THROW")
+        checker.evaluate()
+        checker.auto_solver.generate_guess(checker.guessed_letters)
+        source = tmp_path / "words.txt"
+        source.write_text("cheat\nlemon\n")
+        assert LexiconStore(source, tmp_path / "words.bin").count(5) == 2
+    assert WrdlDictionary.validate is validate
+    assert not instrumentation.enabled()
+    assert tmp_path.joinpath("wrdl.prof").exists()
+
+    snapshot = stats.snapshot()
+    for name in (
+        "GuessChecker.evaluate",
+        "LexiconStore.load",
+        "WrdlDictionary.__init__",
+        "WrdlDictionary.validate",
+        "WrdlSolver.generate_guess",
+        "WrdlSolver.get_plausible_words",
+        "WrdlSolver.observe",
+        "load_sections",
+    ):
+        assert snapshot["timers"][name]["calls"] >= 1
+    assert (
+        0 < snapshot["candidates"][1]["max"] < len(checker.session.dictionary.lexicon)
+    )
+
+    checker.validate("OZONE")
+    assert stats.snapshot() == snapshot
+    instrumentation.reset()
+
+
+def test_spelling_bee(tmp_path):
+    source = tmp_path / "words.txt"
+    source.write_text("cart\ntract\ncarrot\nrot\ntaro\natoc\nactor\nparrot\nocta\n")
+    index = SpellingBeeIndex(LexiconStore(source, compiled_path=None))
+    assert index.solve("CARTOXY", "c") == [
+        "CARROT",
+        "ACTOR",
+        "TRACT",
+        "ATOC",
+        "CART",
+        "OCTA",
+    ]
+    assert index.solve("CARTOXY", "O") == ["CARROT", "ACTOR", "ATOC", "OCTA", "TARO"]
+    assert index.solve_many([("CARTOXY", "Y"), ("CARTOXY", "O")]) == [
+        [],
+        index.solve("CARTOXY", "O"),
+    ]
+    assert index.pangrams == dict()
+    assert is_pangram("CARTOXY", "YXOTRAC")
+    with pytest.raises(ValueError):
+        index.solve("CARTO", "C")
+    with pytest.raises(ValueError):
+        index.solve("CARTOXY", "Z")
+
+
+def test_hard_mode():
+    wordle = Wrdl(force_starting_word="SPILT", blind=True, hard_mode=True)
+    wordle.enter_guess("THICK")
+    assert wordle.checker.evaluate() == (-1, 0, 1, 0, 0)
+    for guess in ("SHIRT", "TRIPS", "ADIEU"):
+        with pytest.raises(HardModeViolation):
+            wordle.enter_guess(guess)
+    assert wordle.checker.valid_guesses == ("THICK",)
+    wordle.enter_guess("STILT")
+    assert wordle.checker.valid_guesses == ("THICK", "STILT")
+    for guess in ("THICK", "stilt"):
+        with pytest.raises(AlreadyGuessed):
+            wordle.enter_guess(guess)
+
+
+def test_adversarial_mode():
+    wordle = Wrdl(blind=True, adversarial=True)
+    session = wordle.checker.session
+    lexicon = session.dictionary.lexicon
+    buckets = collections.Counter(feedback.score("CRANE", word) for word in lexicon)
+    wordle.enter_guess("CRANE")
+    assert len(session.candidates) == max(buckets.values())
+    assert feedback.score("CRANE", session.secret_word) == session.patterns[-1]
+    assert all(
+        feedback.score("CRANE", lexicon[index]) == session.patterns[-1]
+        for index in session.candidates
+    )
+
+    for _ in range(20):
+        if wordle.solved:
+            break
+        wordle.auto_guess()
+    assert wordle.solved and session.candidates == (session.secret,)
+
+
+def test_word_sources(tmp_path):
+    guesses, answers = tmp_path / "guesses.txt.gz", tmp_path / "answers.txt"
+    with gzip.open(guesses, "wt") as wordfile:
+        wordfile.write("cigar 3\nrebut 0.5\nsissy 1\nCIGAR 9\nhumph x\nab1de 2\n")
+        wordfile.write("café 2\nnaïve 1\n")
+    answers.write_text("rebut\nawake\n")
+    store = LexiconStore(guesses, answers=answers, weighted=True)
+    assert store.compiled_path is None
+    bucket = store[5]
+    assert store.lengths == (5,)
+    assert bucket.words == ("AWAKE", "CIGAR", "REBUT", "SISSY")
+    assert bucket.answers == ("AWAKE", "REBUT")
+    assert bucket.weights == (1.0, 9.0, 0.5, 1.0)
+    assert bucket.weight("CIGAR") == 9.0
+
+    solver = WrdlSolver(5, store=store)
+    assert solver.get_plausible_words(dict()) == ("AWAKE", "REBUT")
+    assert solver.grade_guess("CIGAR") > solver.grade_guess("SISSY")
+
+    wordle = Wrdl(blind=True, store=store)
+    assert wordle.checker.session.secret_word in bucket.answers
+    wordle.enter_guess("CIGAR")
+    assert wordle.checker.valid_guesses == ("CIGAR",)
+
+    # A plain custom list must not overwrite the bundled dictionary's artifact.
+    LexiconStore().buckets
+    before = COMPILED_PATH.stat()
+    custom = tmp_path / "custom.txt"
+    custom.write_text("cigar\nrebut\nab\n")
+    store = LexiconStore(custom)
+    assert store.compiled_path is None
+    assert store.count(5) == 2 and store.count(6) == 0
+    after = COMPILED_PATH.stat()
+    assert (after.st_mtime_ns, after.st_size) == (before.st_mtime_ns, before.st_size)
+
+
+def test_multiboard():
+    secrets = ("BLOOM", "CIGAR", "REBUT", "SISSY")
+    checker = MultiBoardChecker(5, secrets=secrets)
+    checker.validate("CRANE")
+    assert checker.evaluate() == tuple(
+        feedback.decode(feedback.score("CRANE", secret), 5) for secret in secrets
+    )
+    lexicon = checker.auto_solver.dictionary.lexicon
+    for secret, candidates in zip(secrets, checker.auto_solver.candidates):
+        assert lexicon.index(secret) in candidates
+        assert all(
+            feedback.score("CRANE", lexicon[index]) == feedback.score("CRANE", secret)
+            for index in candidates
+        )
+    with pytest.raises(AlreadyGuessed):
+        checker.validate("crane")
+
+    checker.validate("BLOOM")
+    assert checker.solved_boards == (True, False, False, False)
+    assert checker.auto_solver.candidates[0] is None
+    assert play_game(checker, max_guesses=20) is not None
+    assert checker.solved
+    assert all(
+        board.valid_guesses[-1] == secret
+        for board, secret in zip(checker.boards, secrets)
+    )
+    assert len(checker.boards[0].valid_guesses) == 2
+    with pytest.raises(ValueError):
+        MultiBoardChecker(5, boards=33)
+
+
+def test_strategy_evaluator(tmp_path):
+    report = evaluate_strategy(2, workers=1)
+    assert report.games == len(WrdlDictionary(2).lexicon)
+    assert report.distribution == simulate(2, all_answers=True, workers=1).distribution
+    assert report.worst_guesses == max(report.distribution)
+    assert evaluate_strategy(2, workers=2).distribution == report.distribution
+
+    path = save_report(report, tmp_path)
+    assert path.name == "2-best.json"
+    saved = json.loads(path.read_text())
+    assert saved["games"] == report.games and saved["failures"] == 0
+    assert sum(saved["distribution"].values()) == report.games
+
+    assert evaluate_strategy(2, "random", answers=("AB", "AD"), workers=1).games == 2
+    with pytest.raises(ValueError):
+        evaluate_strategy(2, "psychic")
+
+
+def test_solver_cache(tmp_path):
+    cache = SolverCache(maxsize=3)
+    first, second = (GuessChecker(5, "BLOOM", cache=cache) for _ in range(2))
+    for checker in (first, second):
+        guess = checker.auto_solver.generate_guess(
+            checker.guessed_letters, **STRATEGIES["best"]
+        )
+        checker.validate(guess)
+        plausible = checker.auto_solver.get_plausible_words(checker.guessed_letters)
+    assert cache.stats["hits"] == 2 and cache.stats["misses"] == 2
+    lexicon = second.auto_solver.dictionary.lexicon
+    state = cache.get(cache.key(lexicon, second.auto_solver.history))
+    assert plausible == tuple(lexicon[index] for index in state.candidates)
+    opening = cache.get(cache.key(lexicon, ()))
+    assert opening.guesses == {"best": guess}
+
+    cache.save(tmp_path / "cache.json.gz")
+    loaded = SolverCache.load(tmp_path / "cache.json.gz")
+    assert len(loaded) == len(cache) == 2
+    third = WrdlSolver(5, cache=loaded)
+    assert third.generate_guess(dict(), **STRATEGIES["best"]) == guess
+    assert loaded.stats["hits"] == 1
+
+    for secret in ("CIGAR", "REBUT", "SISSY"):
+        checker = GuessChecker(5, secret, cache=cache)
+        checker.validate(guess)
+        checker.auto_solver.get_plausible_words(checker.guessed_letters)
+    assert len(cache) == 3 and cache.stats["evictions"] == 2
+
+    manual = WrdlSolver(5, cache=cache)
+    manual.update_model(0, "Q", 1)
+    size = len(cache)
+    assert all(word[0] == "Q" for word in manual.get_plausible_words(dict()))
+    assert len(cache) == size
+
+    source = tmp_path / "words.txt"
+    source.write_text("cigar\nrebut\nsissy\nhumph\nawake\nblush\nfocal\nevade\n")
+    store, cache = LexiconStore(source), SolverCache()
+    bounded, unbounded = (
+        WrdlSolver(5, store=store, cache=cache, time_budget=None, node_budget=budget)
+        for budget in (1, None)
+    )
+    assert bounded.generate_guess(dict(), **STRATEGIES["entropy"]) == "AWAKE"
+    assert unbounded.generate_guess(dict(), **STRATEGIES["entropy"]) == (
+        unbounded.most_informative_guess(store[5].words)
+    )
+    assert len(cache.get(cache.key(store[5], ())).guesses) == 2
+
+
+def test_batched_scoring():
+    words = (
+        "AABBA", "ALLAY", "ALLOY", "ASSES", "BAAAB", "EEEEE", "EERIE", "LLAMA",
+        "SASSY", "SPEED", "THERE", "TORSO",
+    )  # fmt: skip
+    for guess in words:
+        row = feedback.score_many(guess, words)
+        assert row.typecode == feedback.typecode_for(5)
+        assert list(row) == [
+            feedback.encode(reference_evaluation(guess, secret)) for secret in words
+        ]
+    for secret in words:
+        assert list(feedback.score_guesses(words, secret)) == [
+            feedback.score(guess, secret) for guess in words
+        ]
+    # Every letter is yellow except the H, which sits in the middle of both.
+    assert feedback.score("ABCDEFGHIJKLMNO", "ONMLKJIHGFEDCBA") == (
+        (3**15 - 1) // 2 + 3**7
+    )
+    assert len(feedback.score_many("CRANE", ())) == 0
+
+
+def test_prefetch():
+    wordle = Wrdl(force_starting_word="BLOOM", blind=True, prefetch=True)
+    modes = wordle.modes
+    opening = WrdlSolver(5).generate_guess(dict(), **modes)
+    assert wordle.prefetcher.result((), modes) == opening
+    assert wordle.prefetcher.result((), STRATEGIES["random"]) is None
+    assert wordle.hint() == opening
+
+    wordle.auto_guess()
+    assert wordle.checker.valid_guesses == (opening,)
+    history = wordle.auto_solver.history
+    expected = WrdlSolver(5)
+    expected.observe(opening, wordle.checker.evaluate())
+    assert wordle.prefetcher.result(history, modes) == expected.generate_guess(
+        wordle.checker.guessed_letters, **modes
+    )
+    assert wordle.auto_solver.cache.stats["size"] >= 2
+
+    wordle.reset("CIGAR")
+    assert wordle.prefetcher.result(history, modes) is None
+    assert wordle.prefetcher.result((), modes) == opening
+    while not wordle.solved:
+        wordle.auto_guess()
+    assert wordle.checker.valid_guesses[-1] == "CIGAR"
+    wordle.prefetcher.shutdown()
+
+    # A move prefetched under other solver settings is never served.
+    wordle = Wrdl(force_starting_word="BLOOM", blind=True, prefetch=True)
+    assert wordle.prefetcher.result((), modes) == opening
+    wordle.auto_solver.probe_words = True
+    assert wordle.prefetcher.result((), modes) is None
+    wordle.auto_solver.probe_words = False
+    wordle.auto_solver.time_budget = 0.5
+    assert wordle.prefetcher.result((), modes) is None
+    wordle.prefetcher.shutdown()
+
+    wordle = Wrdl(blind=True, prefetch=True, time_budget=0.5, probe_words=True)
+    assert wordle.auto_solver.time_budget == 0.5 and wordle.auto_solver.probe_words
+    assert wordle.prefetcher.result((), modes) is not None
+    wordle.prefetcher.shutdown()
+
+
+def test_stats_store(tmp_path):
+    path = tmp_path / "stats.sqlite"
+    with StatsStore(path, batch_size=2) as store:
+        wordle = Wrdl(force_starting_word="BLOOM", blind=True, stats=store)
+        wordle.enter_guess("CHEAT")
+        wordle.enter_guess("BLOOM")
+        assert wordle.completed_games == 1 and wordle.streak == 1
+        assert wordle.scores[2] == "100.0%" and wordle.scores[6] == "0.0%"
+        store.record_many(5, [("CIGAR", 3), ("BLOOM", None), ("BLOOM", 9)], 6)
+        assert wordle.streak == 0 and wordle.completed_games == 4
+        simulate(5, secrets=("CIGAR",), workers=1, stats=store)
+
+    with StatsStore(path) as store:
+        stats = store.stats(5)
+        assert (stats.games, stats.wins) == (5, 3)
+        assert (stats.streak, stats.best_streak) == (1, 2)
+        assert stats.distribution[2] == 1 and stats.distribution[3] >= 1
+        assert stats.difficulty("BLOOM") == {
+            "games": 3,
+            "win_rate": 1 / 3,
+            "mean_guesses": 2.0,
+        }
+        assert stats.hardest(1) == ["BLOOM"]
+        assert Wrdl(max_guesses=10, blind=True, stats=store).scores[10] == "0.0%"
+        games = store.connection.execute("SELECT COUNT(*) FROM games").fetchone()
+        assert games == (5,)
+        assert not store.stats(6).games
+
+
+def test_word_index(tmp_path):
+    source = tmp_path / "words.txt"
+    source.write_text(
+        "chant\ncoast\ncraft\ncheat\ncleat\nsilent\nlisten\ntinsel\nenlist\n"
+        "geese\neerie\nllama\n"
+    )
+    index = WordIndex(LexiconStore(source, compiled_path=None))
+    assert index.match("C?A?T") == ("CHANT", "COAST", "CRAFT")
+    assert index.match("c?a?t", include="s") == ("COAST",)
+    assert index.match("C?A?T", exclude="SH") == ("CRAFT",)
+    assert index.match("C.EAT") == ("CHEAT", "CLEAT")
+    assert index.match("?????", include="EE") == ("EERIE", "GEESE")
+    assert index.match("?????", include="ESE") == ("GEESE",)
+    assert index.match("C_EAT", include="E", exclude="E") == ()
+    assert index.match("??????????") == ()
+    assert index.anagrams("inlets") == ("ENLIST", "LISTEN", "SILENT", "TINSEL")
+    assert index.anagrams("MALAL") == ("LLAMA",)
+    assert index.anagrams("QQ") == ()
+
+    words = WrdlDictionary(5).lexicon
+    assert match("?RA?E", "E", "ST") == tuple(
+        word
+        for word in words
+        if word[1:3] == "RA" and word[4] == "E" and not set("ST") & set(word)
+    )
+    assert index.query_many(
+        [
+            {"anagram": "tinsel"},
+            {"pattern": "CHEAT"},
+            {"anagram": "LISTEN"},
+            {"pattern": "?????", "include": "AL", "exclude": "M"},
+        ]
+    ) == [
+        index.anagrams("SILENT"),
+        ("CHEAT",),
+        index.anagrams("SILENT"),
+        ("CLEAT",),
+    ]
+    with pytest.raises(ValueError):
+        index.match("C*A*T")
+    with pytest.raises(ValueError):
+        index.anagrams("AB1")
@@ -0,0 +1,161 @@
+import bisect
+import collections
+from collections.abc import Sequence
+import mmap
+import os
+from pathlib import Path
+import struct
+
+from .files import atomic_write
+from .sources import normalize
+
+DICTIONARY_PATH = Path(__file__).parent.joinpath("dictionary.txt").resolve()
+COMPILED_PATH = DICTIONARY_PATH.with_suffix(".bin")
+FORMAT_VERSION = 2
+# Little-endian layout: a header (magic, version, section count, SHA-256 of the
+# source text), one (word length, word count, byte offset) entry per section,
+# then each section's sorted words as fixed-width ASCII with no separators.
+HEADER = struct.Struct("<8sHH32s")
+MAGIC = b"WRDLDICT"
+SECTION = struct.Struct("<HIQ")
+
+
+class CompiledDictionaryError(ValueError):
+    pass
+
+
+class MappedSection(Sequence):
+    def __init__(self, buffer, length, count, offset):
+        self.__buffer = buffer
+        self.__count = int(count)
+        self.__length = int(length)
+        self.__offset = int(offset)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self[i] for i in range(*index.indices(self.__count)))
+        if index < 0:
+            index += self.__count
+        if not 0 <= index < self.__count:
+            raise IndexError("word index out of range")
+        start = self.__offset + index * self.__length
+        return self.__buffer[start : start + self.__length].decode("ascii")
+
+    def __iter__(self):
+        records = self.raw.tobytes().decode("ascii")
+        for start in range(0, len(records), self.__length):
+            yield records[start : start + self.__length]
+
+    def __len__(self):
+        return self.__count
+
+    def __contains__(self, word):
+        position = bisect.bisect_left(self, word)
+        return position < self.__count and self[position] == word
+
+    @property
+    def raw(self):
+        size = self.__count * self.__length
+        return memoryview(self.__buffer)[self.__offset : self.__offset + size]
+
+
+def checksum(source=DICTIONARY_PATH):
+    import hashlib
+
+    with open(source, "rb") as source_file:
+        return hashlib.sha256(source_file.read()).digest()
+
+
+def compile_dictionary(source=DICTIONARY_PATH, target=COMPILED_PATH):
+    source, target = Path(source), Path(target)
+    words_by_length = collections.defaultdict(set)
+    with open(source, "rb") as source_file:
+        raw_source = source_file.read()
+    # The same rule as a streamed word list, so the two loaders agree.
+    lines = raw_source.decode("utf-8", errors="replace").splitlines()
+    for word, _ in normalize(lines):
+        words_by_length[len(word)].add(word)
+
+    lengths = sorted(words_by_length)
+    offset = HEADER.size + SECTION.size * len(lengths)
+    table, records = [], []
+    for length in lengths:
+        words = sorted(words_by_length[length])
+        table.append(SECTION.pack(length, len(words), offset))
+        records.append("".join(words).encode("ascii"))
+        offset += len(records[-1])
+
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, len(lengths), checksum(source))
+    with atomic_write(target) as target_file:
+        target_file.write(header)
+        target_file.writelines(table)
+        target_file.writelines(records)
+    return target
+
+
+def read_sections(target=COMPILED_PATH, expected_checksum=None):
+    with open(target, "rb") as target_file:
+        try:
+            buffer = mmap.mmap(target_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise CompiledDictionaryError(f"{target} is empty")
+
+    try:
+        magic, version, section_count, digest = HEADER.unpack_from(buffer)
+    except struct.error:
+        raise CompiledDictionaryError(f"{target} is truncated")
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise CompiledDictionaryError(f"{target} is not a v{FORMAT_VERSION} word list")
+    if expected_checksum is not None and digest != expected_checksum:
+        raise CompiledDictionaryError(f"{target} is stale")
+
+    sections = dict()
+    for entry in range(section_count):
+        length, count, offset = SECTION.unpack_from(
+            buffer, HEADER.size + entry * SECTION.size
+        )
+        if offset + length * count > len(buffer):
+            raise CompiledDictionaryError(f"{target} is truncated")
+        sections[length] = MappedSection(buffer, length, count, offset)
+    return sections
+
+
+def read_manifest(source=DICTIONARY_PATH, target=COMPILED_PATH):
+    # Word counts straight from the section table, without hashing the source or
+    # mapping the words. A compiled file older than its source may be stale, so
+    # it yields None and callers fall back to a full load.
+    try:
+        if os.stat(target).st_mtime_ns < os.stat(source).st_mtime_ns:
+            return None
+        with open(target, "rb") as target_file:
+            magic, version, section_count, _ = HEADER.unpack(
+                target_file.read(HEADER.size)
+            )
+            if magic != MAGIC or version != FORMAT_VERSION:
+                return None
+            table = target_file.read(SECTION.size * section_count)
+        return {length: count for length, count, _ in SECTION.iter_unpack(table)}
+    except (OSError, struct.error):
+        return None
+
+
+def load_sections(source=DICTIONARY_PATH, target=COMPILED_PATH):
+    expected_checksum = checksum(source)
+    try:
+        return read_sections(target, expected_checksum)
+    except (OSError, CompiledDictionaryError):
+        compile_dictionary(source, target)
+        return read_sections(target, expected_checksum)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m wrdllib.compiled",
+        description="Compile a Wrdl word list into its memory-mappable form.",
+    )
+    parser.add_argument("-s", "--source", default=DICTIONARY_PATH)
+    parser.add_argument("-o", "--output", default=COMPILED_PATH)
+    args = parser.parse_args()
+    print(f"Wrote {compile_dictionary(args.source, args.output)}")
@@ -0,0 +1,105 @@
+import string
+
+ALPHABET = string.ascii_uppercase
+BITS = {letter: 1 << index for index, letter in enumerate(ALPHABET)}
+EVERY_LETTER = (1 << len(ALPHABET)) - 1
+
+
+def encode_positions(word):
+    # One 26-bit field per position with exactly one bit set.
+    code = 0
+    for position, letter in enumerate(word):
+        code |= BITS[letter] << (26 * position)
+    return code
+
+
+def encode_counts(word):
+    # Field k holds every letter the word has at least k + 1 copies of.
+    code, seen = 0, dict()
+    for letter in word:
+        copies = seen.get(letter, 0)
+        code |= BITS[letter] << (26 * copies)
+        seen[letter] = copies + 1
+    return code
+
+
+class ConstraintModel:
+    __slots__ = ("length", "masks", "minimums", "maximums")
+
+    def __init__(self, length):
+        self.length = int(length)
+        self.masks = [EVERY_LETTER] * self.length
+        self.minimums = dict()
+        self.maximums = dict()
+
+    def admits(self, word, extra_letters=""):
+        counts = encode_counts(word)
+        required = self.required_counts(extra_letters)
+        return (
+            encode_positions(word) & self.forbidden_positions() == 0
+            and counts & required == required
+            and counts & self.forbidden_counts() == 0
+        )
+
+    def allowed(self, position):
+        mask = self.masks[int(position)]
+        return "".join(letter for letter in ALPHABET if mask & BITS[letter])
+
+    def apply(self, guess, evaluations):
+        present, absent = dict(), set()
+        for position, (letter, evaluation) in enumerate(zip(guess, evaluations)):
+            if evaluation == 1:
+                self.masks[position] = BITS[letter]
+            else:
+                self.masks[position] &= ~BITS[letter]
+            if evaluation == 0:
+                absent.add(letter)
+            else:
+                present[letter] = present.get(letter, 0) + 1
+
+        for letter, copies in present.items():
+            self.require(letter, copies)
+        for letter in absent:
+            self.limit(letter, present.get(letter, 0))
+
+    def forbidden_counts(self):
+        code = 0
+        for letter, maximum in self.maximums.items():
+            if maximum < self.length:
+                code |= BITS[letter] << (26 * maximum)
+        return code
+
+    def forbidden_positions(self):
+        code = 0
+        for position, mask in enumerate(self.masks):
+            code |= (~mask & EVERY_LETTER) << (26 * position)
+        return code
+
+    def limit(self, letter, maximum):
+        maximum = min(self.maximums.get(letter, self.length), int(maximum))
+        self.maximums[letter] = maximum
+        if maximum == 0:
+            self.masks = [mask & ~BITS[letter] for mask in self.masks]
+
+    def require(self, letter, minimum):
+        self.minimums[letter] = max(self.minimums.get(letter, 0), int(minimum))
+
+    def update(self, position, letter, evaluation):
+        position = int(position)
+        if evaluation == 1:
+            self.masks[position] = BITS[letter]
+        else:
+            self.masks[position] &= ~BITS[letter]
+        if evaluation:
+            self.require(letter, 1)
+        elif not self.minimums.get(letter):
+            self.limit(letter, 0)
+
+    def required_counts(self, extra_letters=""):
+        code = 0
+        for letter, minimum in self.minimums.items():
+            for copies in range(minimum):
+                code |= BITS[letter] << (26 * copies)
+        for letter in extra_letters:
+            code |= BITS[letter]
+        return code
@@ -0,0 +1,188 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import gzip
+import json
+import os
+from pathlib import Path
+
+from . import feedback
+from .files import write_json
+from .guesses import WrdlSolver, check_strategy
+
+FORMAT_VERSION = 1
+MAX_DEPTH = 32
+
+
+class DecisionNode:
+    __slots__ = ("guess", "children")
+
+    def __init__(self, guess, children=None):
+        self.guess = guess
+        self.children = children or dict()
+
+    def __len__(self):
+        return 1 + sum(len(child) for child in self.children.values())
+
+    def depth(self):
+        return 1 + max((child.depth() for child in self.children.values()), default=0)
+
+    def to_json(self):
+        if not self.children:
+            return [self.guess]
+        return [
+            self.guess,
+            {str(pattern): child.to_json() for pattern, child in self.children.items()},
+        ]
+
+    @classmethod
+    def from_json(cls, data):
+        children = data[1] if len(data) > 1 else dict()
+        return cls(
+            data[0],
+            {int(pattern): cls.from_json(child) for pattern, child in children.items()},
+        )
+
+
+class DecisionTree:
+    def __init__(self, length, strategy, digest, root):
+        self.length = int(length)
+        self.strategy = strategy
+        self.digest = digest
+        self.root = root
+
+    def follow(self, history):
+        node = self.root
+        for guess, pattern in history:
+            if node is None or node.guess != guess:
+                return None
+            node = node.children.get(pattern)
+        return node
+
+    def save(self, path):
+        path = Path(path)
+        data = {
+            "version": FORMAT_VERSION,
+            "length": self.length,
+            "strategy": self.strategy,
+            "digest": self.digest,
+            "tree": self.root.to_json(),
+        }
+        write_json(path, data)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with gzip.open(path, "rt", encoding="ascii") as tree_file:
+            data = json.load(tree_file)
+        if data.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a v{FORMAT_VERSION} decision tree")
+        return cls(
+            data["length"],
+            data["strategy"],
+            data["digest"],
+            DecisionNode.from_json(data["tree"]),
+        )
+
+
+def choose_best(solver, candidates):
+    return max(candidates, key=solver.grade_guess)
+
+
+def choose_entropy(solver, candidates):
+    return solver.most_informative_guess(candidates)
+
+
+CHOOSERS = {
+    "best": choose_best,
+    "entropy": choose_entropy,
+}
+
+
+def partition(guess, candidates):
+    buckets = feedback.partition(guess, candidates)
+    buckets.pop(feedback.solved_pattern(len(guess)), None)
+    return buckets
+
+
+def grow(solver, strategy, candidates, depth=0):
+    node = DecisionNode(CHOOSERS[strategy](solver, candidates))
+    if depth >= MAX_DEPTH:
+        return node
+    for pattern, bucket in partition(node.guess, candidates).items():
+        node.children[pattern] = grow(solver, strategy, bucket, depth + 1)
+    return node
+
+
+def grow_subtree(job):
+    length, strategy, time_budget, candidates, checkpoint = job
+    if checkpoint is not None and checkpoint.exists():
+        with gzip.open(checkpoint, "rt", encoding="ascii") as subtree_file:
+            return DecisionNode.from_json(json.load(subtree_file))
+    solver = WrdlSolver(length, time_budget=time_budget)
+    subtree = grow(solver, strategy, candidates, depth=1)
+    if checkpoint is not None:
+        write_json(checkpoint, subtree.to_json())
+    return subtree
+
+
+def build_tree(
+    length,
+    strategy="best",
+    answers=None,
+    workers=1,
+    checkpoint_dir=None,
+    time_budget=None,
+):
+    check_strategy(strategy, CHOOSERS)
+    solver = WrdlSolver(length, time_budget=time_budget)
+    length = solver.dictionary.length
+    answers = tuple(solver.dictionary.lexicon.answers if answers is None else answers)
+    digest = feedback.digest(answers, answers).hex()
+
+    if checkpoint_dir is not None:
+        checkpoint_dir = Path(checkpoint_dir).joinpath(f"{length}-{strategy}-{digest}")
+        checkpoint_dir.mkdir(parents=True, exist_ok=True)
+    root = DecisionNode(CHOOSERS[strategy](solver, answers))
+    buckets = partition(root.guess, answers)
+    jobs = [
+        (
+            length,
+            strategy,
+            time_budget,
+            bucket,
+            checkpoint_dir and checkpoint_dir.joinpath(f"{pattern}.json.gz"),
+        )
+        for pattern, bucket in buckets.items()
+    ]
+    if int(workers) > 1:
+        with ProcessPoolExecutor(max_workers=int(workers)) as executor:
+            subtrees = list(executor.map(grow_subtree, jobs))
+    else:
+        subtrees = list(map(grow_subtree, jobs))
+    root.children = dict(zip(buckets, subtrees))
+    return DecisionTree(length, strategy, digest, root)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    parser = argparse.ArgumentParser(
+        prog="python -m wrdllib.decision_tree",
+        description="Precompute a Wrdl solver's decision tree.",
+    )
+    parser.add_argument("output")
+    parser.add_argument("-l", "--word-length", default=5)
+    parser.add_argument("-g", "--strategy", choices=sorted(CHOOSERS), default="best")
+    parser.add_argument("-w", "--workers", default=os.cpu_count() or 1)
+    parser.add_argument("-r", "--resume-from", default=None)
+    parser.add_argument("-t", "--time-budget", default=1.0)
+    args = parser.parse_args()
+    tree = build_tree(
+        args.word_length,
+        strategy=args.strategy,
+        workers=args.workers,
+        checkpoint_dir=args.resume_from,
+        time_budget=float(args.time_budget),
+    )
+    print(
+        f"Wrote {len(tree.root)} nodes, {tree.root.depth()} levels deep, "
+        f"to {tree.save(args.output)}"
+    )
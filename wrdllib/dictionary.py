@@ -1,42 +1,39 @@
-import collections
-from pathlib import Path
-
 from .exceptions import (
     InvalidGuess,
     InvalidGuessChars,
     InvalidGuessLength,
+    NoSuchDictionary,
 )
+from .lexicon import LEXICON
 
 
 class WrdlDictionary:
-    def __init__(self, length):
+    def __init__(self, length, store=None):
         self.__length = int(length)
-
-        with open(
-            Path(__file__).parent.joinpath("dictionary.txt").resolve()
-        ) as wordfile:
-            self.__lexicon = list(
-                filter(
-                    None,
-                    set(self.validate(word, fail_silently=True) for word in wordfile),
-                )
+        self.__store = LEXICON if store is None else store
+        if not self.__store.count(self.__length):
+            raise NoSuchDictionary(
+                f"No dictionary loaded for {self.__length}-letter words."
             )
-
-        self.letter_counts = tuple(
-            collections.Counter(word[position] for word in self.lexicon)
-            for position in range(self.length)
-        )
+        self.__lexicon = None
 
     @property
     def length(self):
         return self.__length
 
+    @property
+    def letter_counts(self):
+        return self.lexicon.letter_counts
+
     @property
     def lexicon(self):
-        try:
-            return tuple(self.__lexicon)
-        except AttributeError:
-            return None
+        if self.__lexicon is None:
+            self.__lexicon = self.__store[self.__length]
+        return self.__lexicon
+
+    @property
+    def store(self):
+        return self.__store
 
     def validate(self, word, fail_silently=False):
         word = str(word).upper().strip()
@@ -48,7 +45,7 @@ class WrdlDictionary:
             if any(not char.isalpha() for char in word):
                 raise InvalidGuessChars()
 
-            if self.lexicon is not None and word not in self.lexicon:
+            if word not in self.lexicon:
                 raise InvalidGuess()
         except InvalidGuess:
             if fail_silently:
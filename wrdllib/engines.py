@@ -0,0 +1,113 @@
+class PythonEngine:
+    def __init__(self, lexicon):
+        self.lexicon = lexicon
+
+    def filter(self, model, misplaced_letters, selection=None):
+        codes = self.lexicon.codes
+        forbidden_positions = model.forbidden_positions()
+        forbidden_counts = model.forbidden_counts()
+        required_counts = model.required_counts(misplaced_letters)
+        return tuple(
+            index
+            for index in (range(len(codes)) if selection is None else selection)
+            if codes[index][0] & forbidden_positions == 0
+            and codes[index][1] & required_counts == required_counts
+            and codes[index][1] & forbidden_counts == 0
+        )
+
+    def indices(self, selection):
+        return tuple(range(len(self.lexicon))) if selection is None else selection
+
+    def select(self, indices):
+        return tuple(indices)
+
+    def words(self, selection):
+        if selection is None:
+            return self.lexicon
+        return tuple(self.lexicon[index] for index in selection)
+
+
+class NumpyEngine:
+    def __init__(self, lexicon):
+        import numpy
+
+        self.numpy = numpy
+        self.lexicon = lexicon
+        try:
+            raw = lexicon.words.raw
+        except AttributeError:
+            raw = "".join(lexicon).encode("ascii")
+        self.codes = numpy.frombuffer(raw, dtype=numpy.uint8).reshape(
+            len(lexicon), lexicon.length
+        )
+        self.positions = numpy.arange(lexicon.length)
+        self.__letter_counts = None
+
+    @property
+    def letter_counts(self):
+        if self.__letter_counts is None:
+            counts = self.numpy.zeros((len(self.lexicon), 26), dtype=self.numpy.uint8)
+            rows = self.numpy.arange(len(self.lexicon))
+            for position in self.positions:
+                counts[rows, self.codes[:, position] - ord("A")] += 1
+            self.__letter_counts = counts
+        return self.__letter_counts
+
+    def filter(self, model, misplaced_letters, selection=None):
+        codes = self.codes if selection is None else self.codes[selection]
+        allowed = self.numpy.zeros((self.lexicon.length, 256), dtype=bool)
+        letters = self.numpy.arange(26)
+        for position, mask in enumerate(model.masks):
+            allowed[position, ord("A") + letters] = (mask >> letters) & 1
+        keep = allowed[self.positions, codes].all(axis=1)
+
+        bounded = set(misplaced_letters) | set(model.minimums) | set(model.maximums)
+        if bounded:
+            counts = (
+                self.letter_counts
+                if selection is None
+                else self.letter_counts[selection]
+            )
+            for letter in bounded:
+                minimum = max(
+                    model.minimums.get(letter, 0), letter in misplaced_letters
+                )
+                maximum = model.maximums.get(letter, model.length)
+                column = counts[:, ord(letter) - ord("A")]
+                keep &= (column >= minimum) & (column <= maximum)
+
+        if selection is None:
+            return self.numpy.flatnonzero(keep)
+        return selection[keep]
+
+    def indices(self, selection):
+        if selection is None:
+            return tuple(range(len(self.lexicon)))
+        return tuple(selection.tolist())
+
+    def select(self, indices):
+        return self.numpy.asarray(indices, dtype=self.numpy.intp)
+
+    def words(self, selection):
+        if selection is None:
+            return self.lexicon
+        return tuple(self.lexicon[index] for index in selection.tolist())
+
+
+ENGINES = {
+    "python": PythonEngine,
+    "numpy": NumpyEngine,
+}
+
+
+def engine_class(name):
+    try:
+        return ENGINES[str(name).lower()]
+    except KeyError:
+        raise ValueError(
+            f"unknown engine {name!r}; choose one of {', '.join(sorted(ENGINES))}"
+        )
+
+
+def get_engine(name, lexicon):
+    return engine_class(name)(lexicon)
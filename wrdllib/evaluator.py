@@ -0,0 +1,144 @@
+import argparse
+import collections
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+from pathlib import Path
+import time
+
+from . import feedback
+from .decision_tree import CHOOSERS
+from .guesses import STRATEGIES, WrdlSolver, check_strategy
+from .simulation import GUESS_LIMIT, SimulationReport, simulate
+
+_solver = None
+_memo = None
+
+
+def sweep(solver, strategy, candidates, memo, depth=1):
+    # Returns how many guesses each candidate secret takes from this node, as
+    # counts. A deterministic strategy makes the same move for the same
+    # candidates, so every secret sharing a feedback history shares one guess
+    # and one partition, and a candidate set reached twice is solved once.
+    if depth > GUESS_LIMIT:
+        return collections.Counter({None: len(candidates)})
+    key = tuple(candidates)
+    if key in memo:
+        return memo[key]
+    guess = CHOOSERS[strategy](solver, candidates)
+    solved = feedback.solved_pattern(solver.dictionary.length)
+    outcome = collections.Counter()
+    for pattern, bucket in feedback.partition(guess, candidates).items():
+        if pattern == solved:
+            outcome[1] += len(bucket)
+            continue
+        for guesses, count in sweep(solver, strategy, bucket, memo, depth + 1).items():
+            outcome[None if guesses is None else guesses + 1] += count
+    memo[key] = outcome
+    return outcome
+
+
+def start_worker(length, time_budget):
+    global _memo, _solver
+    _solver = WrdlSolver(length, time_budget=time_budget)
+    _memo = dict()
+
+
+def sweep_bucket(job):
+    strategy, bucket = job
+    return sweep(_solver, strategy, bucket, _memo, depth=2)
+
+
+def evaluate_strategy(
+    length=5,
+    strategy="best",
+    answers=None,
+    max_guesses=6,
+    workers=None,
+    time_budget=None,
+    seed=0,
+):
+    check_strategy(strategy)
+    if strategy not in CHOOSERS:
+        # Random play has no shared prefixes to reuse, so each secret is
+        # simply played out once.
+        return simulate(
+            length=length,
+            all_answers=answers is None,
+            secrets=answers,
+            strategy=strategy,
+            max_guesses=max_guesses,
+            workers=workers,
+            seed=seed,
+            time_budget=time_budget,
+        )
+
+    started = time.perf_counter()
+    start_worker(length, time_budget)
+    length = _solver.dictionary.length
+    answers = tuple(_solver.dictionary.lexicon.answers if answers is None else answers)
+    guess = CHOOSERS[strategy](_solver, answers)
+    buckets = feedback.partition(guess, answers)
+    outcome = collections.Counter(
+        {1: len(buckets.pop(feedback.solved_pattern(length), ()))}
+    )
+    jobs = [(strategy, bucket) for bucket in buckets.values()]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(int(workers), 1)
+    if workers == 1 or len(jobs) <= 1:
+        results = list(map(sweep_bucket, jobs))
+    else:
+        # The biggest subtrees go first so no worker is left with a long tail.
+        jobs.sort(key=lambda job: len(job[1]), reverse=True)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=start_worker,
+            initargs=(length, time_budget),
+        ) as executor:
+            results = list(executor.map(sweep_bucket, jobs))
+    for result in results:
+        for guesses, count in result.items():
+            outcome[None if guesses is None else guesses + 1] += count
+    return SimulationReport(
+        length,
+        strategy,
+        max_guesses,
+        list(outcome.elements()),
+        time.perf_counter() - started,
+    )
+
+
+def save_report(report, output_dir):
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    path = output_dir.joinpath(f"{report.length}-{report.strategy}.json")
+    path.write_text(json.dumps(report.to_json(), indent=2) + "\n")
+    return path
+
+
+if __name__ == "__main__":  # pragma: no cover
+    parser = argparse.ArgumentParser(
+        prog="python -m wrdllib.evaluator",
+        description="Play every answer of each word length with a Wrdl strategy.",
+    )
+    parser.add_argument("-l", "--word-length", action="append", type=int)
+    parser.add_argument("-g", "--strategy", choices=sorted(STRATEGIES), default="best")
+    parser.add_argument("-m", "--max-guesses", default=6)
+    parser.add_argument("-w", "--workers", default=None)
+    parser.add_argument("-t", "--time-budget", default=None)
+    parser.add_argument("-o", "--output-dir", default="reports")
+    parser.add_argument("--seed", default=0)
+    args = parser.parse_args()
+    for length in args.word_length or (5,):
+        report = evaluate_strategy(
+            length,
+            strategy=args.strategy,
+            max_guesses=int(args.max_guesses),
+            workers=args.workers,
+            time_budget=args.time_budget and float(args.time_budget),
+            seed=int(args.seed),
+        )
+        print(report)
+        print(f"Wrote {save_report(report, args.output_dir)}\n")
@@ -19,6 +19,10 @@ class InvalidGuessLength(InvalidGuess):
     default_message = "Wrong length for a guess!"
 
 
+class HardModeViolation(InvalidGuess):
+    default_message = "Hard mode guesses must use every revealed hint."
+
+
 class ImpossibleSolution(RuntimeError, WrdlException):
     default_message = "No plausible words remain but the puzzle is unsolved."
 
@@ -27,6 +31,10 @@ class GameOver(RuntimeError, WrdlException):
     pass
 
 
+class MismatchedDecisionTree(ValueError, WrdlException):
+    default_message = "That decision tree was built for a different game."
+
+
 class NoSuchDictionary(OSError, WrdlException):
     pass
 
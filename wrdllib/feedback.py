@@ -0,0 +1,323 @@
+import array
+import collections
+import functools
+import itertools
+import mmap
+import os
+from pathlib import Path
+import struct
+import sys
+
+from .files import atomic_write
+
+CACHE_DIR = Path(os.environ.get("WRDL_CACHE_DIR", Path.home() / ".cache" / "wrdl"))
+FORMAT_VERSION = 1
+# Header: magic, version, word length, item size, byte order, guess count,
+# answer count, SHA-256 of both word lists; then one row of patterns per guess.
+HEADER = struct.Struct("<8sHHHHII32s")
+MAGIC = b"WRDLFBK\0"
+BYTE_ORDERS = {"little": 0, "big": 1}
+DIGITS = {0: 0, -1: 1, 1: 2}
+EVALUATIONS = (0, -1, 1)
+POWERS = tuple(3**position for position in range(16))
+
+
+class FeedbackTableError(ValueError):
+    pass
+
+
+def encode(evaluations):
+    pattern = 0
+    for evaluation in reversed(tuple(evaluations)):
+        pattern = pattern * 3 + DIGITS[evaluation]
+    return pattern
+
+
+@functools.lru_cache(maxsize=4096)
+def decode(pattern, length):
+    evaluations = []
+    for _ in range(int(length)):
+        pattern, digit = divmod(pattern, 3)
+        evaluations.append(EVALUATIONS[digit])
+    return tuple(evaluations)
+
+
+def solved_pattern(length):
+    return 3 ** int(length) - 1
+
+
+@functools.lru_cache(maxsize=65536)
+def plan(guess):
+    # Letters the guess holds once need no counting: when not green they are
+    # yellow exactly when the secret has them at all. Only repeated letters
+    # are counted against the secret, greens first and then left to right.
+    positions = collections.defaultdict(list)
+    for position, letter in enumerate(guess):
+        positions[letter].append((position, POWERS[position]))
+    singles = tuple(
+        (letter, *places[0]) for letter, places in positions.items() if len(places) == 1
+    )
+    repeats = tuple(
+        (letter, tuple(places))
+        for letter, places in positions.items()
+        if len(places) > 1
+    )
+    return singles, repeats
+
+
+def score(guess, secret):
+    singles, repeats = plan(guess)
+    pattern = 0
+    for letter, position, weight in singles:
+        if secret[position] == letter:
+            pattern += weight + weight
+        elif letter in secret:
+            pattern += weight
+    for letter, places in repeats:
+        unmatched = secret.count(letter)
+        for position, weight in places:
+            if secret[position] == letter:
+                pattern += weight + weight
+                unmatched -= 1
+        for position, weight in places:
+            if unmatched <= 0:
+                break
+            if secret[position] != letter:
+                pattern += weight
+                unmatched -= 1
+    return pattern
+
+
+def score_many(guess, secrets):
+    # score() with the plan lookup hoisted out and the loop inlined, so a
+    # whole row costs no Python call per secret.
+    singles, repeats = plan(guess)
+    patterns = array.array(typecode_for(len(guess)))
+    append = patterns.append
+    for secret in secrets:
+        pattern = 0
+        for letter, position, weight in singles:
+            if secret[position] == letter:
+                pattern += weight + weight
+            elif letter in secret:
+                pattern += weight
+        for letter, places in repeats:
+            unmatched = secret.count(letter)
+            for position, weight in places:
+                if secret[position] == letter:
+                    pattern += weight + weight
+                    unmatched -= 1
+            for position, weight in places:
+                if unmatched <= 0:
+                    break
+                if secret[position] != letter:
+                    pattern += weight
+                    unmatched -= 1
+        append(pattern)
+    return patterns
+
+
+def score_guesses(guesses, secret):
+    return array.array(
+        typecode_for(len(secret)), map(score, guesses, itertools.repeat(secret))
+    )
+
+
+def largest_bucket(buckets):
+    # Ties go to the lowest pattern, so the solved pattern only wins a tie when
+    # it is the only bucket left.
+    return max(buckets.items(), key=lambda item: (len(item[1]), -item[0]))
+
+
+def partition(guess, answers, scorer=score):
+    buckets = collections.defaultdict(list)
+    if scorer is score:
+        patterns = score_many(guess, answers)
+    else:
+        patterns = (scorer(guess, answer) for answer in answers)
+    for pattern, answer in zip(patterns, answers):
+        buckets[pattern].append(answer)
+    return buckets
+
+
+def typecode_for(length):
+    if solved_pattern(length) <= 0xFF:
+        return "B"
+    elif solved_pattern(length) <= 0xFFFF:
+        return "H"
+    return "I"
+
+
+def digest(guesses, answers):
+    import hashlib
+
+    checksum = hashlib.sha256()
+    for words in (guesses, answers):
+        checksum.update(str(len(words)).encode("ascii"))
+        for word in words:
+            checksum.update(word.encode("ascii"))
+    return checksum.digest()
+
+
+class FeedbackTable:
+    def __init__(self, length, guesses, answers, patterns):
+        self.length = int(length)
+        self.guesses = guesses
+        self.answers = answers
+        self.patterns = patterns
+        self.__guess_index = {word: index for index, word in enumerate(guesses)}
+        self.__answer_index = {word: index for index, word in enumerate(answers)}
+
+    def __contains__(self, pair):
+        guess, answer = pair
+        return guess in self.__guess_index and answer in self.__answer_index
+
+    def evaluations(self, guess, answer):
+        return decode(self.pattern(guess, answer), self.length)
+
+    def pattern(self, guess, answer):
+        return self.patterns[
+            self.__guess_index[guess] * len(self.answers) + self.__answer_index[answer]
+        ]
+
+    def row(self, guess):
+        start = self.__guess_index[guess] * len(self.answers)
+        return self.patterns[start : start + len(self.answers)]
+
+
+def build_patterns(length, guesses, answers, chunk_size=256, vectorized=None):
+    numpy = None
+    if vectorized is None or vectorized:
+        try:
+            import numpy
+        except ImportError:
+            if vectorized:
+                raise
+
+    if numpy is None:
+        patterns = array.array(typecode_for(length))
+        for guess in guesses:
+            patterns.extend(score_many(guess, answers))
+        return memoryview(patterns)
+
+    dtype = numpy.dtype(typecode_for(length))
+    answer_codes, guess_codes = (
+        numpy.frombuffer("".join(words).encode("ascii"), dtype=numpy.uint8).reshape(
+            len(words), length
+        )
+        - ord("A")
+        for words in (answers, guesses)
+    )
+    answer_letter_counts = numpy.zeros((26, len(answers)), dtype=numpy.uint8)
+    for position in range(length):
+        numpy.add.at(
+            answer_letter_counts,
+            (answer_codes[:, position], numpy.arange(len(answers))),
+            1,
+        )
+    patterns = numpy.zeros((len(guesses), len(answers)), dtype=dtype)
+    for start in range(0, len(guesses), chunk_size):
+        chunk = guess_codes[start : start + chunk_size]
+        hits = chunk[:, None, :] == answer_codes[None, :, :]
+        repeats = chunk[:, :, None] == chunk[:, None, :]
+        digits = numpy.zeros((len(chunk), len(answers)), dtype=dtype)
+        for position in range(length):
+            # Yellows go left to right: this copy of the letter is yellow when
+            # the copies before it, plus the green copies after it, leave an
+            # unmatched copy in the answer.
+            claimed = numpy.repeat(
+                repeats[:, :position, position].sum(axis=1, dtype=numpy.uint8)[:, None],
+                len(answers),
+                axis=1,
+            )
+            later = repeats[:, position + 1 :, position]
+            rows = numpy.flatnonzero(later.any(axis=1))
+            if len(rows):
+                claimed[rows] += (
+                    hits[rows, :, position + 1 :] & later[rows, None, :]
+                ).sum(axis=2, dtype=numpy.uint8)
+            greens = hits[:, :, position]
+            yellows = ~greens & (claimed < answer_letter_counts[chunk[:, position]])
+            weight = dtype.type(3**position)
+            digits += greens * (weight + weight) + yellows * weight
+        patterns[start : start + len(chunk)] = digits
+    return memoryview(patterns.reshape(-1)).cast("B").cast(typecode_for(length))
+
+
+def build_table(length, guesses, answers=None, **kw):
+    guesses = tuple(guesses)
+    answers = guesses if answers is None else tuple(answers)
+    return FeedbackTable(
+        length, guesses, answers, build_patterns(length, guesses, answers, **kw)
+    )
+
+
+def cache_path(length, guesses, answers, cache_dir=CACHE_DIR):
+    return Path(cache_dir).joinpath(
+        f"feedback-{int(length)}-{digest(guesses, answers).hex()[:16]}.bin"
+    )
+
+
+def save_table(table, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    header = HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        table.length,
+        table.patterns.itemsize,
+        BYTE_ORDERS[sys.byteorder],
+        len(table.guesses),
+        len(table.answers),
+        digest(table.guesses, table.answers),
+    )
+    with atomic_write(path) as table_file:
+        table_file.write(header)
+        table_file.write(table.patterns.cast("B"))
+    return path
+
+
+def read_table(length, guesses, answers, path):
+    with open(path, "rb") as table_file:
+        try:
+            buffer = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise FeedbackTableError(f"{path} is empty")
+
+    try:
+        fields = HEADER.unpack_from(buffer)
+    except struct.error:
+        raise FeedbackTableError(f"{path} is truncated")
+    expected = (
+        MAGIC,
+        FORMAT_VERSION,
+        int(length),
+        struct.calcsize(typecode_for(length)),
+        BYTE_ORDERS[sys.byteorder],
+        len(guesses),
+        len(answers),
+        digest(guesses, answers),
+    )
+    if fields != expected:
+        raise FeedbackTableError(f"{path} does not match these word lists")
+    size = len(guesses) * len(answers) * struct.calcsize(typecode_for(length))
+    if HEADER.size + size > len(buffer):
+        raise FeedbackTableError(f"{path} is truncated")
+    patterns = memoryview(buffer)[HEADER.size : HEADER.size + size]
+    return FeedbackTable(length, guesses, answers, patterns.cast(typecode_for(length)))
+
+
+def load_table(length, guesses, answers=None, cache_dir=CACHE_DIR, **kw):
+    guesses = tuple(guesses)
+    answers = guesses if answers is None else tuple(answers)
+    path = cache_path(length, guesses, answers, cache_dir)
+    try:
+        return read_table(length, guesses, answers, path)
+    except (OSError, FeedbackTableError):
+        pass
+    table = build_table(length, guesses, answers, **kw)
+    try:
+        save_table(table, path)
+    except OSError:  # pragma: no cover
+        pass
+    return table
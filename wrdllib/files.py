@@ -0,0 +1,30 @@
+from contextlib import contextmanager
+import os
+from pathlib import Path
+
+
+@contextmanager
+def atomic_write(path):
+    # The data goes to a temporary file beside the target, which replaces it
+    # only once complete, so a reader never sees a partly written file.
+    import tempfile
+
+    path = Path(path)
+    handle, temporary = tempfile.mkstemp(dir=path.parent, prefix=path.name)
+    try:
+        with os.fdopen(handle, "wb") as target_file:
+            yield target_file
+        os.chmod(temporary, 0o644)
+        os.replace(temporary, path)
+    except BaseException:
+        Path(temporary).unlink(missing_ok=True)
+        raise
+
+
+def write_json(path, data):
+    import gzip
+    import json
+
+    with atomic_write(path) as target_file:
+        with gzip.open(target_file, "wt", encoding="ascii") as json_file:
+            json.dump(data, json_file, separators=(",", ":"))
@@ -1,162 +1,357 @@
-import collections
-from pathlib import Path
+import copy
+import math
 import random
 import string
 import time
 
+from . import feedback
 from .ansi import ANSI
+from .constraints import ConstraintModel
 from .dictionary import WrdlDictionary
-from .exceptions import AlreadyGuessed, ImpossibleSolution, NoSuchDictionary
+from .engines import engine_class
+from .exceptions import (
+    AlreadyGuessed,
+    HardModeViolation,
+    ImpossibleSolution,
+    MismatchedDecisionTree,
+    NoSuchDictionary,
+)
+from .session import AdversarialSession, GameSession
+
+STRATEGIES = {
+    "best": {"best_guess": True, "random_guess": False},
+    "entropy": {"entropy_guess": True, "random_guess": False},
+    "random": {"random_guess": True},
+}
+
+
+def check_strategy(strategy, choices=STRATEGIES):
+    if strategy not in choices:
+        raise ValueError(
+            f"unknown strategy {strategy!r}; choose one of "
+            f"{', '.join(sorted(choices))}"
+        )
+    return strategy
 
 
 class WrdlSolver:
-    def __init__(self, length):
+    def __init__(
+        self,
+        length,
+        engine="python",
+        feedback_table=None,
+        decision_tree=None,
+        probe_words=False,
+        time_budget=1.0,
+        node_budget=None,
+        store=None,
+        cache=None,
+    ):
         length = min(max(int(length), 2), 15)
         try:
-            self.dictionary = WrdlDictionary(length)
-        except OSError:  # pragma: no cover
+            self.dictionary = WrdlDictionary(length, store)
+        except OSError:
             raise NoSuchDictionary(f"No dictionary loaded for {length}-letter words.")
-        self.__auto_guess_model = [string.ascii_uppercase] * self.dictionary.length
+        self.__engine_class = engine_class(engine)
+        self.__engine = None
+        self.feedback_table = feedback_table
+        self.__decision_tree = None
+        self.decision_tree = decision_tree
+        self.probe_words = bool(probe_words)
+        self.time_budget = time_budget
+        self.node_budget = node_budget
+        self.cache = cache
+        self.reset()
 
-    def get_plausible_words(self, guessed_letters):
-        words = tuple(
-            word
-            for word in self.dictionary.lexicon
-            if all(
-                letter in self.__auto_guess_model[position]
-                for position, letter in enumerate(word)
-            )
-            and all(
-                misplaced_letter in word
-                for misplaced_letter in "".join(
-                    char
-                    for char in string.ascii_uppercase
-                    if guessed_letters.get(char) == -1
+    @property
+    def decision_tree(self):
+        return self.__decision_tree
+
+    @decision_tree.setter
+    def decision_tree(self, tree):
+        # A tree only knows the moves for the answers it was built against, so
+        # one from another length or answer list would suggest invalid words.
+        if tree is not None:
+            lexicon = self.dictionary.lexicon
+            if tree.length != lexicon.length:
+                raise MismatchedDecisionTree(
+                    f"Decision tree is for {tree.length}-letter words, "
+                    f"not {lexicon.length}."
                 )
-            )
+            answers = tuple(lexicon.answers)
+            if tree.digest != feedback.digest(answers, answers).hex():
+                raise MismatchedDecisionTree(
+                    "Decision tree was built for another answer list."
+                )
+        self.__decision_tree = tree
+
+    @property
+    def engine(self):
+        if self.__engine is None:
+            self.__engine = self.__engine_class(self.dictionary.lexicon)
+        return self.__engine
+
+    def get_plausible_words(self, guessed_letters):
+        misplaced_letters = "".join(
+            char for char in string.ascii_uppercase if guessed_letters.get(char) == -1
         )
+        if self.__plausible_words is None or misplaced_letters != self.__misplaced:
+            self.__state = None
+            if self.cache is not None and not self.__manual:
+                # The feedback history fixes the candidates, so a game that
+                # retraces another's history reuses its filtering outright.
+                key = self.cache.key(self.dictionary.lexicon, self.history)
+                self.__state = self.cache.get(key)
+            if self.__state is not None:
+                self.__candidates = self.engine.select(self.__state.candidates)
+            else:
+                answers = self.dictionary.lexicon.answer_indices
+                if self.__candidates is None and len(answers) < len(
+                    self.dictionary.lexicon
+                ):
+                    self.__candidates = self.engine.select(answers)
+                # Constraints only ever tighten during a game, so each call
+                # narrows the previous survivors rather than rescanning the
+                # whole lexicon.
+                self.__candidates = self.engine.filter(
+                    self.__auto_guess_model, misplaced_letters, self.__candidates
+                )
+                if self.cache is not None and not self.__manual:
+                    self.__state = self.cache.put(
+                        key, self.engine.indices(self.__candidates)
+                    )
+            self.__misplaced = misplaced_letters
+            self.__plausible_words = self.engine.words(self.__candidates)
+        words = self.__plausible_words
         if not words:  # pragma: no cover
             raise ImpossibleSolution()
         else:
             return words
 
-    def generate_guess(self, guessed_letters, random_guess=True, best_guess=False):
-        if random_guess and best_guess:
+    def fork(self):
+        # A fresh game with this solver's settings, sharing its lexicon, engine
+        # and cache, that can be driven independently of this one.
+        solver = copy.copy(self)
+        solver.reset()
+        return solver
+
+    def generate_guess(
+        self, guessed_letters, random_guess=True, best_guess=False, entropy_guess=False
+    ):
+        if sum(map(bool, (random_guess, best_guess, entropy_guess))) > 1:
             raise ValueError(
-                "random_guess and best_guess are mutually exclusive arguments"
+                "random_guess, best_guess and entropy_guess are mutually exclusive "
+                "arguments"
             )
         elif random_guess:
             return random.choice(self.get_plausible_words(guessed_letters))
-        elif best_guess:
-            return sorted(
-                self.get_plausible_words(guessed_letters),
-                key=self.grade_guess,
-                reverse=True,
-            )[0]
+
+        if best_guess:
+            mode = "best"
+        elif entropy_guess:
+            mode = "entropy-probe" if self.probe_words else "entropy"
         else:
-            raise ValueError("one of modes 'random_guess' or 'best_guess' is required")
+            raise ValueError(
+                "one of modes 'random_guess', 'best_guess' or 'entropy_guess' is "
+                "required"
+            )
+        tree = self.__decision_tree
+        if tree is not None and tree.strategy == mode:
+            node = tree.follow(self.history)
+            if node is not None:
+                return node.guess
+        words = self.get_plausible_words(guessed_letters)
+        state = self.__state
+        if not best_guess:
+            # A budget can cut the search short, so entropy moves are only
+            # shared between solvers searching with the same budgets.
+            mode = f"{mode}:{self.time_budget}:{self.node_budget}"
+        if state is not None and mode in state.guesses:
+            return state.guesses[mode]
+        if best_guess:
+            guess = sorted(words, key=self.grade_guess, reverse=True)[0]
+        else:
+            guess = self.most_informative_guess(words)
+        if state is not None:
+            state.guesses[mode] = guess
+        return guess
+
+    def most_informative_guess(
+        self, candidates, probe_words=None, time_budget=None, node_budget=None
+    ):
+        probe_words = self.probe_words if probe_words is None else probe_words
+        time_budget = self.time_budget if time_budget is None else time_budget
+        node_budget = self.node_budget if node_budget is None else node_budget
+        if len(candidates) <= 2:
+            return candidates[0]
+
+        pool = sorted(candidates, key=self.grade_guess, reverse=True)
+        if probe_words:
+            plausible = frozenset(candidates)
+            pool.extend(
+                sorted(
+                    (word for word in self.dictionary.lexicon if word not in plausible),
+                    key=self.grade_guess,
+                    reverse=True,
+                )
+            )
+
+        total = len(candidates)
+        information = math.log2(total)
+        xlogx = [0.0] + [count * math.log2(count) for count in range(1, total + 1)]
+        ceiling = math.log2(min(total, 3**self.dictionary.length))
+        deadline = time_budget and time.perf_counter() + time_budget
+        best_guess, best_entropy, nodes = pool[0], -1.0, 0
+
+        for guess in pool:
+            # Putting every unscored candidate in a bucket of its own is the
+            # best this guess could still do, so it is pruned once even that
+            # cannot beat the best guess so far.
+            buckets, spread = dict(), 0.0
+            for scored, answer in enumerate(candidates, 1):
+                pattern = self.score(guess, answer)
+                count = buckets.get(pattern, 0)
+                buckets[pattern] = count + 1
+                spread += xlogx[count + 1] - xlogx[count]
+                if information - spread / total <= best_entropy:
+                    break
+            else:
+                best_guess, best_entropy = guess, information - spread / total
+                if best_entropy >= ceiling - 1e-9:
+                    break
+
+            nodes += scored
+            if node_budget and nodes >= node_budget:
+                break
+            if deadline and time.perf_counter() >= deadline:
+                break
+
+        return best_guess
 
     def grade_guess(self, guess):
-        return sum(
+        grade = sum(
             self.dictionary.letter_counts[position][guess[position]]
             for position in range(self.dictionary.length)
         )
+        weight = self.dictionary.lexicon.weight(guess)
+        if weight is None:
+            return grade
+        # Word frequency acts as a prior: common words outrank obscure ones with
+        # similar letters, without swamping the letter statistics.
+        return grade * (1 + math.log1p(max(weight, 0.0)))
+
+    @property
+    def history(self):
+        return tuple(self.__history.items())
+
+    @property
+    def model(self):
+        return self.__auto_guess_model
+
+    def observe(self, guess, evaluations):
+        if guess not in self.__history:
+            self.__auto_guess_model.apply(guess, evaluations)
+            self.__plausible_words = None
+            self.__state = None
+        self.__history[guess] = feedback.encode(evaluations)
 
     def read_from_model(self, index):
-        return self.__auto_guess_model[int(index)]
+        return self.__auto_guess_model.allowed(index)
 
     def reveal_model(self):  # pragma: no cover
         for position in range(self.dictionary.length):
             print(f"{position}: {self.read_from_model(position)}")
 
+    def reset(self):
+        self.__auto_guess_model = ConstraintModel(self.dictionary.length)
+        self.__candidates = None
+        self.__misplaced = ""
+        self.__plausible_words = None
+        self.__history = dict()
+        self.__manual = False
+        self.__state = None
+
+    def score(self, guess, answer):
+        if self.feedback_table is not None and (guess, answer) in self.feedback_table:
+            return self.feedback_table.pattern(guess, answer)
+        return feedback.score(guess, answer)
+
     def update_model(self, index, letter, evaluation):
         index, letter, evaluation = int(index), str(letter), int(evaluation)
-        if evaluation == 1:
-            self.__auto_guess_model[index] = letter
-        else:
-            if evaluation == 0:
-                for index, _ in enumerate(self.__auto_guess_model):
-                    self.__auto_guess_model[index] = "".join(
-                        char
-                        for char in self.__auto_guess_model[index]
-                        if char != letter
-                    )
-            else:
-                self.__auto_guess_model[index] = "".join(
-                    char for char in self.__auto_guess_model[index] if char != letter
-                )
+        # Hand-made constraints are not described by the feedback history, so
+        # this game stops reading from and writing to the cache.
+        self.__manual = True
+        self.__plausible_words = None
+        self.__state = None
+        self.__auto_guess_model.update(index, letter, evaluation)
 
 
 class GuessChecker:
-    def __init__(self, length, force_starting_word=None):
-        self.auto_solver = WrdlSolver(length)
+    def __init__(
+        self,
+        length,
+        force_starting_word=None,
+        engine="python",
+        feedback_table=None,
+        hard_mode=False,
+        adversarial=False,
+        store=None,
+        cache=None,
+    ):
+        self.auto_solver = WrdlSolver(
+            length,
+            engine=engine,
+            feedback_table=feedback_table,
+            store=store,
+            cache=cache,
+        )
+        self.hard_mode = bool(hard_mode)
+        session = AdversarialSession if adversarial else GameSession
+        self.session = session(self.auto_solver.dictionary)
         self.reset(force_starting_word)
 
     def evaluate(self, index=-1):
-        guess = self.__valid_guesses[int(index)]
-        evaluations = [None] * self.auto_solver.dictionary.length
-        guessed_letter_counts = collections.defaultdict(int)
-        letter_counts = collections.Counter(self.__secret_word)
-
-        for position, letter in enumerate(guess):
-            if self.__secret_word[position] == letter:
-                evaluation = 1
-            elif letter not in self.__secret_word:
-                evaluation = 0
-            else:
-                continue
-            evaluations[position] = evaluation
-            guessed_letter_counts[letter] += evaluation
-
-        for position, evaluation in enumerate(evaluations):
-            if evaluation is not None:
-                continue
-            guessed_letter = guess[position]
-            if guessed_letter_counts[guessed_letter] >= letter_counts[guessed_letter]:
-                evaluations[position] = 0
-            else:
-                evaluations[position] = -1
-            guessed_letter_counts[guessed_letter] += 1
+        return feedback.decode(
+            self.session.patterns[int(index)], self.auto_solver.dictionary.length
+        )
 
-        position = 0
-        for letter, evaluation in zip(guess, evaluations):
-            self.__guessed_letters[letter] = evaluation
-            self.auto_solver.update_model(position, letter, evaluation)
-            yield evaluation
-            position += 1
+    @property
+    def evaluations(self):
+        return self.session.evaluations
 
     @property
     def guessed_letters(self):
-        return dict(self.__guessed_letters)
+        return self.session.guessed_letters
 
     def reset(self, force_starting_word=None):
-        self.__secret_word = None
-        if force_starting_word is not None:
-            force_starting_word = force_starting_word.upper()
-            if force_starting_word in self.auto_solver.dictionary.lexicon:
-                self.__secret_word = force_starting_word
-        if self.__secret_word is None:
-            self.__secret_word = random.choice(self.auto_solver.dictionary.lexicon)
-        self.__guessed_letters = dict()
-        self.__valid_guesses = list()
+        self.auto_solver.reset()
+        self.session.reset(force_starting_word)
 
     def reveal_answer(self):  # pragma: no cover
-        print(f"Answer: {ANSI.BOLD}{ANSI.RED}{self.__secret_word}")
+        print(f"Answer: {ANSI.BOLD}{ANSI.RED}{self.session.secret_word}")
 
     def validate(self, guess):
-        guess = self.auto_solver.dictionary.validate(guess)
-        if guess in self.__valid_guesses:
-            raise AlreadyGuessed()
-        self.__valid_guesses.append(guess)
+        if self.hard_mode and self.session.guesses:
+            guess = self.session.dictionary.validate(guess)
+            # A repeat is reported as one, just as it is outside hard mode.
+            if guess in self.session.valid_guesses:
+                raise AlreadyGuessed()
+            if not self.auto_solver.model.admits(guess):
+                raise HardModeViolation()
+        pattern = self.session.guess(guess, self.auto_solver.score)
+        guess = self.session.valid_guesses[-1]
+        self.auto_solver.observe(
+            guess, feedback.decode(pattern, self.auto_solver.dictionary.length)
+        )
         return guess
 
     @property
     def valid_guesses(self):
-        return tuple(self.__valid_guesses)
+        return self.session.valid_guesses
 
     @property
     def win_message(self):  # pragma: no cover
-        match len(self.__valid_guesses):
+        match len(self.session.guesses):
             case 0:
                 return "Unbelievable!"
             case 1:
@@ -0,0 +1,189 @@
+from contextlib import contextmanager
+import cProfile
+import functools
+import threading
+import time
+
+TARGETS = (
+    ("dictionary", "WrdlDictionary", "__init__"),
+    ("dictionary", "WrdlDictionary", "validate"),
+    # The dictionary is read on first use, not in WrdlDictionary.__init__.
+    ("lexicon", "LexiconStore", "load"),
+    ("lexicon", None, "load_sections"),
+    ("guesses", "WrdlSolver", "get_plausible_words"),
+    ("guesses", "WrdlSolver", "generate_guess"),
+    ("guesses", "WrdlSolver", "observe"),
+    ("guesses", "WrdlSolver", "update_model"),
+    ("guesses", "GuessChecker", "evaluate"),
+)
+
+
+class Timer:
+    __slots__ = ("calls", "total", "maximum", "histogram")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        # Bucket n counts calls that took under 2**n microseconds.
+        self.histogram = dict()
+
+    def record(self, elapsed):
+        self.calls += 1
+        self.total += elapsed
+        self.maximum = max(self.maximum, elapsed)
+        bucket = int(elapsed * 1e6).bit_length()
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+
+    @property
+    def mean(self):
+        return self.total / self.calls if self.calls else 0.0
+
+    def to_json(self):
+        return {
+            "calls": self.calls,
+            "total": self.total,
+            "mean": self.mean,
+            "max": self.maximum,
+            "histogram": {
+                f"<{2 ** bucket}us": count
+                for bucket, count in sorted(self.histogram.items())
+            },
+        }
+
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def candidates(self, guess_number, size):
+        with self.lock:
+            sizes = self.candidate_sizes.setdefault(guess_number, [])
+            sizes.append(size)
+
+    def record(self, name, elapsed):
+        with self.lock:
+            if name not in self.timers:
+                self.timers[name] = Timer()
+            self.timers[name].record(elapsed)
+
+    def reset(self):
+        with self.lock:
+            self.timers = dict()
+            self.candidate_sizes = dict()
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "timers": {
+                    name: timer.to_json() for name, timer in sorted(self.timers.items())
+                },
+                "candidates": {
+                    guess_number: {
+                        "samples": len(sizes),
+                        "mean": sum(sizes) / len(sizes),
+                        "min": min(sizes),
+                        "max": max(sizes),
+                    }
+                    for guess_number, sizes in sorted(self.candidate_sizes.items())
+                },
+            }
+
+    def __str__(self):
+        snapshot = self.snapshot()
+        lines = [
+            f"{'call':<36}{'calls':>9}{'total ms':>12}{'mean us':>11}{'max us':>11}"
+        ]
+        for name, timer in snapshot["timers"].items():
+            lines.append(
+                f"{name:<36}{timer['calls']:>9}{timer['total'] * 1e3:>12.2f}"
+                f"{timer['mean'] * 1e6:>11.1f}{timer['max'] * 1e6:>11.1f}"
+            )
+        if snapshot["candidates"]:
+            lines.append("")
+            lines.append(
+                f"{'candidates after':<36}{'samples':>9}{'mean':>12}{'max':>11}"
+            )
+            for guess_number, sizes in snapshot["candidates"].items():
+                lines.append(
+                    f"{f'{guess_number} guesses':<36}{sizes['samples']:>9}"
+                    f"{sizes['mean']:>12.1f}{sizes['max']:>11}"
+                )
+        return "\n".join(lines)
+
+
+STATS = Stats()
+_originals = dict()
+
+
+def instrument(name, function):
+    @functools.wraps(function)
+    def timed(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            STATS.record(name, time.perf_counter() - started)
+
+    if function.__name__ != "get_plausible_words":
+        return timed
+
+    @functools.wraps(function)
+    def counted(solver, *args, **kwargs):
+        words = timed(solver, *args, **kwargs)
+        STATS.candidates(len(solver.history), len(words))
+        return words
+
+    return counted
+
+
+def enable():
+    # Wrappers are patched onto the classes only while enabled, so the disabled
+    # hot path is exactly the uninstrumented code.
+    from . import dictionary, guesses, lexicon
+
+    modules = {"dictionary": dictionary, "guesses": guesses, "lexicon": lexicon}
+    for module, owner, attribute in TARGETS:
+        # A function without an owner is patched where its callers look it up.
+        cls = modules[module] if owner is None else getattr(modules[module], owner)
+        key = (cls, attribute)
+        if key not in _originals:
+            _originals[key] = getattr(cls, attribute)
+            name = attribute if owner is None else f"{owner}.{attribute}"
+            setattr(cls, attribute, instrument(name, _originals[key]))
+
+
+def disable():
+    while _originals:
+        (cls, attribute), function = _originals.popitem()
+        setattr(cls, attribute, function)
+
+
+def enabled():
+    return bool(_originals)
+
+
+def reset():
+    STATS.reset()
+
+
+def snapshot():
+    return STATS.snapshot()
+
+
+@contextmanager
+def profiling(profile_path=None):
+    was_enabled = enabled()
+    enable()
+    profiler = cProfile.Profile() if profile_path else None
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield STATS
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(profile_path)
+        if not was_enabled:
+            disable()
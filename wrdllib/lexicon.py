@@ -0,0 +1,200 @@
+import bisect
+import collections
+from collections.abc import Sequence
+from pathlib import Path
+import threading
+
+from .compiled import COMPILED_PATH, DICTIONARY_PATH, load_sections, read_manifest
+from .constraints import encode_counts, encode_positions
+from .sources import as_source, collect
+
+
+class LexiconBucket(Sequence):
+    def __init__(self, length, words, answer_indices=None, weights=None):
+        self.__length = int(length)
+        self.__words = words
+        self.__answer_indices = answer_indices
+        self.__weights = weights
+        self.__members = None
+        self.__letter_counts = None
+        self.__codes = None
+        self.__version = None
+
+    def __contains__(self, word):
+        return word in self.members
+
+    def __getitem__(self, index):
+        return self.__words[index]
+
+    def __iter__(self):
+        return iter(self.__words)
+
+    def __len__(self):
+        return len(self.__words)
+
+    def index(self, word, start=0, stop=None):
+        stop = len(self.__words) if stop is None else stop
+        position = bisect.bisect_left(self.__words, word, start, stop)
+        if position < stop and self.__words[position] == word:
+            return position
+        raise ValueError(f"{word!r} is not in the {self.length}-letter lexicon")
+
+    @property
+    def answer_indices(self):
+        if self.__answer_indices is None:
+            return range(len(self.__words))
+        return self.__answer_indices
+
+    @property
+    def answers(self):
+        if self.__answer_indices is None:
+            return self.__words
+        return tuple(self.__words[index] for index in self.__answer_indices)
+
+    @property
+    def codes(self):
+        if self.__codes is None:
+            self.__codes = tuple(
+                (encode_positions(word), encode_counts(word)) for word in self.__words
+            )
+        return self.__codes
+
+    @property
+    def length(self):
+        return self.__length
+
+    @property
+    def letter_counts(self):
+        if self.__letter_counts is None:
+            self.__letter_counts = tuple(
+                collections.Counter(word[position] for word in self.__words)
+                for position in range(self.length)
+            )
+        return self.__letter_counts
+
+    @property
+    def members(self):
+        if self.__members is None:
+            self.__members = frozenset(self.__words)
+        return self.__members
+
+    def weight(self, word):
+        if self.__weights is None:
+            return None
+        return self.__weights[self.index(word)]
+
+    @property
+    def weights(self):
+        return self.__weights
+
+    @property
+    def version(self):
+        # Identifies the word list, answers and weights, so cached solver
+        # states never outlive the lexicon they were computed for.
+        if self.__version is None:
+            import hashlib
+
+            from .feedback import digest
+
+            checksum = hashlib.sha256(digest(self.__words, self.answers))
+            if self.__weights is not None:
+                checksum.update(repr(tuple(self.__weights)).encode("ascii"))
+            self.__version = checksum.hexdigest()[:16]
+        return self.__version
+
+    @property
+    def words(self):
+        return self.__words
+
+
+class LexiconStore:
+    def __init__(
+        self,
+        path=DICTIONARY_PATH,
+        compiled_path=COMPILED_PATH,
+        answers=None,
+        weighted=False,
+    ):
+        self.source = as_source(path, weighted)
+        self.answers = as_source(answers)
+        self.path = self.source.path
+        # The compiled format holds plain word lists only, and the shared
+        # artifact belongs to the bundled dictionary: another list compiles
+        # only to a target of its own.
+        self.compiled_path = compiled_path and Path(compiled_path)
+        if (
+            self.compiled_path == COMPILED_PATH
+            and self.path.resolve() != DICTIONARY_PATH
+            or self.answers is not None
+            or self.source.weighted
+            or self.path.suffix == ".gz"
+        ):
+            self.compiled_path = None
+        self.__buckets = None
+        self.__counts = None
+        self.__lock = threading.Lock()
+
+    def __getitem__(self, length):
+        return self.buckets.get(int(length)) or LexiconBucket(length, ())
+
+    def __reduce__(self):
+        # A store crosses to worker processes as its sources, and each worker
+        # loads the words for itself.
+        return (
+            type(self),
+            (self.source, self.compiled_path, self.answers, self.source.weighted),
+        )
+
+    @property
+    def buckets(self):
+        if self.__buckets is None:
+            with self.__lock:
+                if self.__buckets is None:
+                    self.__buckets = self.load()
+        return self.__buckets
+
+    def count(self, length):
+        return self.counts.get(int(length), 0)
+
+    @property
+    def counts(self):
+        if self.__counts is None:
+            manifest = None
+            if self.__buckets is None and self.compiled_path is not None:
+                manifest = read_manifest(self.path, self.compiled_path)
+            if manifest is None:
+                manifest = {
+                    length: len(bucket) for length, bucket in self.buckets.items()
+                }
+            self.__counts = manifest
+        return self.__counts
+
+    def load(self):
+        if self.compiled_path is not None:
+            try:
+                sections = load_sections(self.path, self.compiled_path)
+            except OSError:
+                pass
+            else:
+                return {
+                    length: LexiconBucket(length, words)
+                    for length, words in sections.items()
+                }
+
+        return {
+            length: LexiconBucket(length, words, answer_indices, weights)
+            for length, words, answer_indices, weights in collect(
+                self.source, self.answers
+            )
+        }
+
+    @property
+    def lengths(self):
+        return tuple(sorted(self.buckets))
+
+
+LEXICON = LexiconStore()
+
+
+def get_bucket(length):
+    return LEXICON[length]
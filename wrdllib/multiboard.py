@@ -0,0 +1,277 @@
+import collections
+import math
+import os
+import random
+import time
+
+from . import feedback
+from .ansi import ANSI
+from .engines import NumpyEngine, engine_class
+from .exceptions import AlreadyGuessed, ImpossibleSolution, InvalidGuess, OutOfGuesses
+from .guesses import GuessChecker
+
+BOARDS_PER_ROW = 4
+MAX_BOARDS = 32
+NODE_BUDGET = 200_000
+POOL_SIZE = 128
+
+
+class MultiBoardSolver:
+    def __init__(
+        self,
+        solver,
+        boards,
+        engine="python",
+        pool_size=POOL_SIZE,
+        node_budget=NODE_BUDGET,
+    ):
+        self.solver = solver
+        self.boards = int(boards)
+        self.pool_size = int(pool_size)
+        self.node_budget = int(node_budget)
+        self.vectorized = engine_class(engine) is NumpyEngine
+        self.reset()
+
+    @property
+    def dictionary(self):
+        return self.solver.dictionary
+
+    def generate_guess(self):
+        open_boards = [
+            candidates for candidates in self.candidates if candidates is not None
+        ]
+        if not open_boards:
+            raise ValueError("every board is already solved")
+        if not all(open_boards):  # pragma: no cover
+            raise ImpossibleSolution()
+        lexicon = self.dictionary.lexicon
+        # A board with a single candidate left is solved for free.
+        for candidates in open_boards:
+            if len(candidates) == 1:
+                return lexicon[candidates[0]]
+
+        union, columns = self.union(open_boards)
+        # Words that are live on several boards are the likeliest to pay off,
+        # so they are scored first; letter statistics break the ties. The pool
+        # shrinks as the candidate union grows to keep a move's work bounded.
+        boards_per_word = collections.Counter(
+            index for candidates in open_boards for index in candidates
+        )
+        pool_size = max(1, min(self.pool_size, self.node_budget // len(union)))
+        pool = sorted(
+            union,
+            key=lambda index: (
+                boards_per_word[index],
+                self.solver.grade_guess(lexicon[index]),
+            ),
+            reverse=True,
+        )[:pool_size]
+        patterns = self.patterns([lexicon[index] for index in pool], union)
+        # Boards that share a candidate set share its entropy, so each distinct
+        # set is bucketed once and counted once per board holding it.
+        board_columns = [
+            ([columns[index] for index in candidates], boards)
+            for candidates, boards in collections.Counter(open_boards).items()
+        ]
+
+        deadline = self.solver.time_budget and (
+            time.perf_counter() + self.solver.time_budget
+        )
+        best_guess, best_entropy = pool[0], -1.0
+        for row, guess in enumerate(pool):
+            scores = patterns[row * len(union) : (row + 1) * len(union)]
+            entropy = 0.0
+            for candidates, boards in board_columns:
+                buckets = collections.Counter(scores[column] for column in candidates)
+                total = len(candidates)
+                entropy += boards * (
+                    math.log2(total)
+                    - sum(count * math.log2(count) for count in buckets.values())
+                    / total
+                )
+            if entropy > best_entropy:
+                best_guess, best_entropy = guess, entropy
+            if deadline and time.perf_counter() >= deadline:
+                break
+        return lexicon[best_guess]
+
+    def observe(self, guess, patterns):
+        # Every open board is narrowed from one scoring pass over the union of
+        # their candidates, so a word live on several boards is scored once.
+        open_boards = [
+            candidates for candidates in self.candidates if candidates is not None
+        ]
+        union, columns = self.union(open_boards)
+        scores = self.patterns((guess,), union)
+        solved = feedback.solved_pattern(self.dictionary.length)
+        for board, pattern in enumerate(patterns):
+            candidates = self.candidates[board]
+            if candidates is None or pattern is None:
+                continue
+            self.candidates[board] = (
+                None
+                if pattern == solved
+                else tuple(
+                    index for index in candidates if scores[columns[index]] == pattern
+                )
+            )
+
+    def patterns(self, guesses, answers):
+        lexicon = self.dictionary.lexicon
+        return feedback.build_patterns(
+            self.dictionary.length,
+            tuple(guesses),
+            tuple(lexicon[index] for index in answers),
+            vectorized=self.vectorized,
+        )
+
+    def reset(self):
+        self.candidates = [
+            tuple(self.dictionary.lexicon.answer_indices) for _ in range(self.boards)
+        ]
+
+    @staticmethod
+    def union(boards):
+        union = sorted(set().union(*boards))
+        return union, {index: column for column, index in enumerate(union)}
+
+
+class MultiBoardChecker:
+    def __init__(
+        self,
+        length,
+        boards=4,
+        secrets=None,
+        engine="python",
+        feedback_table=None,
+        store=None,
+        pool_size=POOL_SIZE,
+    ):
+        boards = int(boards if secrets is None else len(secrets))
+        if not 1 <= boards <= MAX_BOARDS:
+            raise ValueError(f"a game needs between 1 and {MAX_BOARDS} boards")
+        self.boards = tuple(
+            GuessChecker(
+                length, engine=engine, feedback_table=feedback_table, store=store
+            )
+            for _ in range(boards)
+        )
+        self.auto_solver = MultiBoardSolver(
+            self.boards[0].auto_solver, boards, engine, pool_size
+        )
+        self.reset(secrets)
+
+    def evaluate(self, index=-1):
+        # Boards stop taking guesses once solved, so each one reports its own
+        # latest evaluation rather than one for the shared guess.
+        return tuple(
+            board.evaluate(index) if board.valid_guesses else None
+            for board in self.boards
+        )
+
+    def reset(self, secrets=None):
+        if secrets is None:
+            # Secrets are distinct unless the answer list is too short for that.
+            answers = self.auto_solver.dictionary.lexicon.answers
+            boards = len(self.boards)
+            if len(answers) >= boards:
+                secrets = random.sample(answers, boards)
+            else:
+                secrets = random.choices(answers, k=boards)
+        for board, secret in zip(self.boards, secrets):
+            board.reset(secret)
+        self.auto_solver.reset()
+        self.valid_guesses = ()
+
+    @property
+    def solved(self):
+        return all(board.session.solved for board in self.boards)
+
+    @property
+    def solved_boards(self):
+        return tuple(board.session.solved for board in self.boards)
+
+    def validate(self, guess):
+        guess = self.auto_solver.dictionary.validate(guess)
+        if guess in self.valid_guesses:
+            raise AlreadyGuessed()
+        patterns = []
+        for board in self.boards:
+            if board.session.solved:
+                patterns.append(None)
+                continue
+            board.validate(guess)
+            patterns.append(board.session.patterns[-1])
+        self.valid_guesses += (guess,)
+        self.auto_solver.observe(guess, patterns)
+        return guess
+
+
+def play_game(checker, max_guesses=None):
+    max_guesses = len(checker.boards) + 5 if max_guesses is None else max_guesses
+    while not checker.solved and len(checker.valid_guesses) < max_guesses:
+        checker.validate(checker.auto_solver.generate_guess())
+    return len(checker.valid_guesses) if checker.solved else None
+
+
+def draw(checker, max_guesses):  # pragma: no cover
+    from .wrdl import Wrdl
+
+    length = checker.auto_solver.dictionary.length
+    os.system("clear")
+    print(
+        f"Playing Wrdl on {len(checker.boards)} boards:\nYou have {max_guesses} "
+        f"guesses to find every {length}-letter word.\n"
+    )
+    for first in range(0, len(checker.boards), BOARDS_PER_ROW):
+        boards = checker.boards[first : first + BOARDS_PER_ROW]
+        for row in range(max_guesses):
+            cells = []
+            for board in boards:
+                if row < len(board.valid_guesses):
+                    cells.append(
+                        "".join(
+                            f"[{Wrdl.MARKERS[grade]}{letter}{ANSI.WHITE} ]"
+                            for grade, letter in zip(
+                                board.evaluations[row], board.valid_guesses[row]
+                            )
+                        )
+                    )
+                else:
+                    cells.append("[   ]" * length)
+            print(f"{ANSI.BOLD}{'  '.join(cells)}")
+        print()
+
+
+def play(checker, max_guesses=None, demo=False, simulations=1):  # pragma: no cover
+    max_guesses = len(checker.boards) + 5 if max_guesses is None else max_guesses
+    length = checker.auto_solver.dictionary.length
+    for iteration in range(simulations if demo else 1):
+        if checker.valid_guesses:
+            checker.reset()
+        draw(checker, max_guesses)
+        while not checker.solved and len(checker.valid_guesses) < max_guesses:
+            try:
+                if demo:
+                    time.sleep(3)
+                    guess = checker.auto_solver.generate_guess()
+                else:
+                    guess = input(f"Enter a {length}-letter guess: ")
+                checker.validate(guess)
+            except (AlreadyGuessed, InvalidGuess) as error:
+                print(str(error) or error.default_message)
+                continue
+            except (EOFError, KeyboardInterrupt):
+                print("\nThe game was terminated early.")
+                return
+            draw(checker, max_guesses)
+        if checker.solved:
+            print(
+                f"{ANSI.BOLD}Solved {len(checker.boards)} boards in "
+                f"{len(checker.valid_guesses)} guesses!"
+            )
+        else:
+            print(OutOfGuesses.default_message)
+            for board in checker.boards:
+                if not board.session.solved:
+                    board.reveal_answer()
@@ -0,0 +1,74 @@
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+from . import feedback
+from .solver_cache import SolverCache
+
+
+class Prefetcher:
+    def __init__(self, solver):
+        # The speculative move is made by a forked solver on one worker thread,
+        # so it never touches the live game's state. Both solvers share a cache,
+        # which leaves the candidates for each state ready for the live solver.
+        if solver.cache is None:
+            solver.cache = SolverCache()
+        self.solver = solver
+        self.__executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="wrdl-prefetch"
+        )
+        self.__pending = None
+
+    def cancel(self):
+        # Work that has already started cannot be interrupted; its result is
+        # simply never claimed, since it is keyed to a history no longer live.
+        if self.__pending is not None:
+            self.__pending[1].cancel()
+            self.__pending = None
+
+    def compute(self, worker, history, guessed_letters, modes):
+        for guess, pattern in history:
+            worker.observe(guess, feedback.decode(pattern, worker.dictionary.length))
+        return worker.generate_guess(guessed_letters, **modes)
+
+    def key(self, history, modes):
+        # The solver's settings can change between a submit and its claim, so
+        # a move made under other settings is never served.
+        solver = self.solver
+        settings = (
+            solver.probe_words,
+            solver.time_budget,
+            solver.node_budget,
+            solver.decision_tree,
+        )
+        return (tuple(history), tuple(sorted(modes.items())), settings)
+
+    def result(self, history, modes):
+        if self.__pending is None:
+            return None
+        key, future = self.__pending
+        if key != self.key(history, modes):
+            return None
+        try:
+            return future.result()
+        except CancelledError:  # pragma: no cover
+            return None
+
+    def shutdown(self):
+        self.cancel()
+        self.__executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, history, guessed_letters, modes):
+        self.cancel()
+        key = self.key(history, modes)
+        # Each move gets a fresh fork, so it is made with the solver's current
+        # settings.
+        self.__pending = (
+            key,
+            self.__executor.submit(
+                self.compute,
+                self.solver.fork(),
+                key[0],
+                dict(guessed_letters),
+                dict(modes),
+            ),
+        )
+        return self.__pending[1]
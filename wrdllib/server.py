@@ -0,0 +1,219 @@
+import argparse
+import asyncio
+import json
+import secrets
+import time
+
+from .exceptions import ImpossibleSolution, InvalidGuess, OutOfGuesses
+from .guesses import WrdlSolver
+from .session import GameSession
+from .solver_cache import SolverCache
+
+IDLE_TIMEOUT = 300
+MAX_LINE = 64 * 1024
+
+
+def field(request, name, kind, default=None, required=False):
+    # Requests come from the network, so a field of the wrong type gets a
+    # readable error rather than failing deep inside the game.
+    if name not in request:
+        if required:
+            raise ValueError(f"Missing field {name!r}.")
+        return default
+    value = request[name]
+    if kind is int and (isinstance(value, bool) or not isinstance(value, int)):
+        raise ValueError(f"Field {name!r} must be an integer.")
+    if kind is str and not isinstance(value, str):
+        raise ValueError(f"Field {name!r} must be a string.")
+    return value
+
+
+class Session(GameSession):
+    __slots__ = ("max_guesses", "last_seen")
+
+    def __init__(self, dictionary, secret=None, max_guesses=6):
+        super().__init__(dictionary, secret)
+        self.max_guesses = max_guesses
+        self.last_seen = time.monotonic()
+
+    def board(self):
+        return {
+            "guesses": list(self.valid_guesses),
+            "evaluations": [list(row) for row in self.evaluations],
+            "guesses_left": self.max_guesses - len(self.guesses),
+            "solved": self.solved,
+        }
+
+
+class WrdlServer:
+    def __init__(self, idle_timeout=IDLE_TIMEOUT, max_sessions=None, cache=None):
+        self.idle_timeout = float(idle_timeout)
+        self.max_sessions = max_sessions
+        self.sessions = dict()
+        self.solvers = dict()
+        self.cache = SolverCache() if cache is None else cache
+
+    def solver(self, length):
+        length = min(max(int(length), 2), 15)
+        if length not in self.solvers:
+            self.solvers[length] = WrdlSolver(length, cache=self.cache)
+        return self.solvers[length]
+
+    def evict_idle(self, now=None):
+        cutoff = (time.monotonic() if now is None else now) - self.idle_timeout
+        idle = [
+            key for key, session in self.sessions.items() if session.last_seen < cutoff
+        ]
+        for key in idle:
+            del self.sessions[key]
+        return len(idle)
+
+    def handle(self, request):
+        try:
+            operation = getattr(self, f"op_{request.get('op')}", None)
+            if operation is None:
+                raise ValueError(f"unknown op {request.get('op')!r}")
+            response = operation(request)
+        except (
+            ImpossibleSolution,
+            InvalidGuess,
+            OutOfGuesses,
+            KeyError,
+            TypeError,
+            ValueError,
+        ) as e:
+            message = e.args[0] if e.args else getattr(e, "default_message", "")
+            response = {"ok": False, "error": str(message or type(e).__name__)}
+        else:
+            response["ok"] = True
+        if "id" in request:
+            response["id"] = request["id"]
+        return response
+
+    def session(self, request):
+        try:
+            session = self.sessions[str(request["session"])]
+        except KeyError:
+            raise KeyError("No such session.")
+        session.last_seen = time.monotonic()
+        return session
+
+    def op_board(self, request):
+        return self.session(request).board()
+
+    def op_close(self, request):
+        self.sessions.pop(str(request.get("session")), None)
+        return dict()
+
+    def op_guess(self, request):
+        session = self.session(request)
+        if session.solved:
+            raise ValueError("Already solved!")
+        if len(session.guesses) >= session.max_guesses:
+            raise OutOfGuesses()
+        session.guess(field(request, "word", str, required=True))
+        return session.board()
+
+    def op_hint(self, request):
+        session = self.session(request)
+        solver = self.solver(session.dictionary.length)
+        lexicon = session.dictionary.lexicon
+        key = self.cache.key(lexicon, zip(session.valid_guesses, session.patterns))
+        state = self.cache.get(key)
+        if state is None:
+            engine = solver.engine
+            candidates = engine.filter(
+                session.constraints(), "", engine.select(lexicon.answer_indices)
+            )
+            state = self.cache.put(key, engine.indices(candidates))
+        if not state.candidates:
+            raise ImpossibleSolution()
+        if "best" not in state.guesses:
+            state.guesses["best"] = max(
+                (lexicon[index] for index in state.candidates), key=solver.grade_guess
+            )
+        return {"guess": state.guesses["best"], "candidates": len(state.candidates)}
+
+    def op_keyboard(self, request):
+        return {"letters": self.session(request).guessed_letters}
+
+    def op_new(self, request):
+        if self.max_sessions is not None and len(self.sessions) >= self.max_sessions:
+            self.evict_idle()
+            if len(self.sessions) >= self.max_sessions:
+                raise ValueError("Too many sessions.")
+        dictionary = self.solver(field(request, "length", int, 5)).dictionary
+        secret = field(request, "secret", str)
+        max_guesses = max(field(request, "max_guesses", int, 6), 1)
+        key = secrets.token_hex(8)
+        self.sessions[key] = Session(dictionary, secret, max_guesses)
+        return {"session": key, "length": dictionary.length}
+
+    def op_stats(self, request):
+        return {"sessions": len(self.sessions), "cache": self.cache.stats}
+
+    async def serve_client(self, reader, writer):
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError()
+                except ValueError:
+                    response = {"ok": False, "error": "Requests must be JSON objects."}
+                else:
+                    response = self.handle(request)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def evict_forever(self):
+        while True:
+            await asyncio.sleep(max(self.idle_timeout / 4, 1))
+            self.evict_idle()
+
+    async def start(self, host="127.0.0.1", port=8765):
+        return await asyncio.start_server(self.serve_client, host, port, limit=MAX_LINE)
+
+    async def serve_forever(self, host="127.0.0.1", port=8765):  # pragma: no cover
+        server = await self.start(host, port)
+        evictor = asyncio.create_task(self.evict_forever())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            evictor.cancel()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    parser = argparse.ArgumentParser(
+        prog="python -m wrdllib.server",
+        description="Serve Wrdl games as line-delimited JSON over TCP.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("-p", "--port", default=8765)
+    parser.add_argument("-i", "--idle-timeout", default=IDLE_TIMEOUT)
+    parser.add_argument("-n", "--max-sessions", default=None)
+    parser.add_argument("-c", "--cache", default=None, help="solver cache path")
+    args = parser.parse_args()
+    cache = None
+    if args.cache:
+        from pathlib import Path
+
+        if Path(args.cache).exists():
+            cache = SolverCache.load(args.cache)
+    server = WrdlServer(
+        idle_timeout=args.idle_timeout,
+        max_sessions=args.max_sessions and int(args.max_sessions),
+        cache=cache,
+    )
+    try:
+        asyncio.run(server.serve_forever(args.host, int(args.port)))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if args.cache:
+            server.cache.save(args.cache)
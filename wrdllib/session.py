@@ -0,0 +1,100 @@
+import random
+
+from . import feedback
+from .constraints import ConstraintModel
+from .exceptions import AlreadyGuessed
+
+
+class GameSession:
+    __slots__ = ("dictionary", "secret", "guesses", "patterns", "model")
+
+    def __init__(self, dictionary, secret=None, model=None):
+        self.dictionary = dictionary
+        self.reset(secret, model)
+
+    def constraints(self):
+        if self.model is not None:
+            return self.model
+        model = ConstraintModel(self.dictionary.length)
+        for guess, evaluations in zip(self.valid_guesses, self.evaluations):
+            model.apply(guess, evaluations)
+        return model
+
+    @property
+    def evaluations(self):
+        return tuple(
+            feedback.decode(pattern, self.dictionary.length)
+            for pattern in self.patterns
+        )
+
+    def guess(self, word, scorer=feedback.score):
+        word = self.dictionary.validate(word)
+        index = self.dictionary.lexicon.index(word)
+        if index in self.guesses:
+            raise AlreadyGuessed()
+        pattern = scorer(word, self.secret_word)
+        self.guesses += (index,)
+        self.patterns += (pattern,)
+        if self.model is not None:
+            self.model.apply(word, feedback.decode(pattern, self.dictionary.length))
+        return pattern
+
+    @property
+    def guessed_letters(self):
+        guessed_letters = dict()
+        for guess, evaluations in zip(self.valid_guesses, self.evaluations):
+            guessed_letters.update(zip(guess, evaluations))
+        return guessed_letters
+
+    def reset(self, secret=None, model=None):
+        lexicon = self.dictionary.lexicon
+        self.secret = None
+        if secret is not None:
+            try:
+                self.secret = lexicon.index(str(secret).upper())
+            except ValueError:
+                pass
+        if self.secret is None:
+            self.secret = random.choice(lexicon.answer_indices)
+        self.guesses = ()
+        self.patterns = ()
+        self.model = model
+
+    @property
+    def secret_word(self):
+        return self.dictionary.lexicon[self.secret]
+
+    @property
+    def solved(self):
+        return bool(self.patterns) and self.patterns[-1] == feedback.solved_pattern(
+            self.dictionary.length
+        )
+
+    @property
+    def valid_guesses(self):
+        return tuple(self.dictionary.lexicon[index] for index in self.guesses)
+
+
+class AdversarialSession(GameSession):
+    __slots__ = ("candidates",)
+
+    def guess(self, word, scorer=feedback.score):
+        # The secret is only pinned down once no other answer is left: each guess
+        # keeps whichever feedback pattern leaves the most candidates alive.
+        word = self.dictionary.validate(word)
+        lexicon = self.dictionary.lexicon
+        if lexicon.index(word) not in self.guesses:
+            _, survivors = feedback.largest_bucket(
+                feedback.partition(
+                    word,
+                    self.candidates,
+                    lambda guess, index: scorer(guess, lexicon[index]),
+                )
+            )
+            self.candidates = tuple(survivors)
+            self.secret = survivors[0]
+        return super().guess(word, scorer)
+
+    def reset(self, secret=None, model=None):
+        super().reset(secret, model)
+        self.candidates = self.dictionary.lexicon.answer_indices
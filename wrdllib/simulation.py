@@ -0,0 +1,189 @@
+import collections
+from concurrent.futures import ProcessPoolExecutor
+import os
+import random
+import time
+
+from .exceptions import ImpossibleSolution
+from .guesses import STRATEGIES, GuessChecker, check_strategy
+from .solver_cache import SolverCache
+
+GUESS_LIMIT = 100
+
+_checker = None
+
+
+class SimulationReport:
+    def __init__(self, length, strategy, max_guesses, results, elapsed):
+        self.length = length
+        self.strategy = strategy
+        self.max_guesses = max_guesses
+        self.distribution = collections.Counter(
+            guesses for guesses in results if guesses is not None
+        )
+        self.elapsed = elapsed
+        self.failures = sum(1 for guesses in results if guesses is None)
+        self.games = len(results)
+
+    def __str__(self):
+        lines = [
+            f"Simulated {self.games} {self.length}-letter games "
+            f"with the {self.strategy} strategy:",
+            f"Win rate: {round(self.win_rate * 100, 1)}%",
+            f"Mean guesses: {round(self.mean_guesses, 2)}",
+            f"Worst case: {self.worst_guesses}",
+            f"Unsolved: {self.failures}",
+            f"Throughput: {round(self.games_per_second, 1)} games/s",
+        ]
+        for guesses in sorted(self.distribution):
+            lines.append(f"{guesses}: {self.distribution[guesses]}")
+        return "\n".join(lines)
+
+    @property
+    def games_per_second(self):
+        return self.games / self.elapsed if self.elapsed else float("inf")
+
+    @property
+    def mean_guesses(self):
+        solved = sum(self.distribution.values())
+        if not solved:
+            return 0.0
+        return sum(g * n for g, n in self.distribution.items()) / solved
+
+    def to_json(self):
+        return {
+            "length": self.length,
+            "strategy": self.strategy,
+            "max_guesses": self.max_guesses,
+            "games": self.games,
+            "wins": self.wins,
+            "failures": self.failures,
+            "mean_guesses": self.mean_guesses,
+            "worst_guesses": self.worst_guesses,
+            "elapsed": self.elapsed,
+            "distribution": {
+                str(guesses): self.distribution[guesses]
+                for guesses in sorted(self.distribution)
+            },
+        }
+
+    @property
+    def wins(self):
+        return sum(
+            count
+            for guesses, count in self.distribution.items()
+            if guesses <= self.max_guesses
+        )
+
+    @property
+    def win_rate(self):
+        return self.wins / self.games if self.games else 0.0
+
+    @property
+    def worst_guesses(self):
+        return max(self.distribution, default=None)
+
+
+def play_game(checker, secret, strategy="best", seed=None):
+    if seed is not None:
+        random.seed(seed)
+    checker.reset(secret)
+    solver = checker.auto_solver
+    while len(checker.valid_guesses) < GUESS_LIMIT:
+        try:
+            guess = solver.generate_guess(
+                checker.guessed_letters, **STRATEGIES[strategy]
+            )
+        except ImpossibleSolution:
+            return None
+        checker.validate(guess)
+        if sum(checker.evaluate()) == solver.dictionary.length:
+            return len(checker.valid_guesses)
+    return None
+
+
+def start_worker(
+    length,
+    engine,
+    time_budget,
+    store=None,
+    hard_mode=False,
+    probe_words=False,
+    decision_tree=None,
+):
+    global _checker
+    # Every game in a worker opens the same way, so the worker's games share
+    # one cache of solver states.
+    _checker = GuessChecker(
+        length,
+        engine=engine,
+        hard_mode=hard_mode,
+        store=store,
+        cache=SolverCache(),
+    )
+    solver = _checker.auto_solver
+    if time_budget is not None:
+        solver.time_budget = time_budget
+    # Probe words break hard mode's rules, so hard games never use them.
+    solver.probe_words = bool(probe_words) and not hard_mode
+    solver.decision_tree = decision_tree
+
+
+def run_game(job):
+    secret, strategy, seed = job
+    return play_game(_checker, secret, strategy, seed)
+
+
+def simulate(
+    length=5,
+    games=100,
+    all_answers=False,
+    secrets=None,
+    strategy="best",
+    max_guesses=6,
+    workers=None,
+    chunksize=None,
+    seed=0,
+    engine="python",
+    time_budget=None,
+    stats=None,
+    store=None,
+    hard_mode=False,
+    probe_words=False,
+    decision_tree=None,
+):
+    check_strategy(strategy)
+    options = (store, hard_mode, probe_words, decision_tree)
+    start_worker(length, engine, time_budget, *options)
+    lexicon = _checker.auto_solver.dictionary.lexicon
+    length = _checker.auto_solver.dictionary.length
+    if secrets is None:
+        if all_answers:
+            secrets = lexicon.answers
+        else:
+            chooser = random.Random(seed)
+            answers = lexicon.answers
+            secrets = tuple(chooser.choice(answers) for _ in range(int(games)))
+    jobs = [
+        (secret, strategy, f"{seed}:{index}") for index, secret in enumerate(secrets)
+    ]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(int(workers), 1)
+    started = time.perf_counter()
+    if workers == 1 or len(jobs) <= 1:
+        results = list(map(run_game, jobs))
+    else:
+        chunksize = chunksize or max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=start_worker,
+            initargs=(length, engine, time_budget, *options),
+        ) as executor:
+            results = list(executor.map(run_game, jobs, chunksize=chunksize))
+    if stats is not None:
+        stats.record_many(length, zip(secrets, results), max_guesses)
+    return SimulationReport(
+        length, strategy, max_guesses, results, time.perf_counter() - started
+    )
@@ -0,0 +1,98 @@
+import collections
+import gzip
+import json
+import threading
+
+from .files import write_json
+
+FORMAT_VERSION = 1
+MAXSIZE = 4096
+
+
+class SolverState:
+    __slots__ = ("candidates", "guesses")
+
+    def __init__(self, candidates, guesses=None):
+        # Candidates are lexicon indices, so a state is independent of the
+        # filtering engine that produced it.
+        self.candidates = tuple(candidates)
+        self.guesses = guesses or dict()
+
+
+class SolverCache:
+    def __init__(self, maxsize=MAXSIZE):
+        self.maxsize = int(maxsize)
+        self.__states = collections.OrderedDict()
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key):
+        return key in self.__states
+
+    def __len__(self):
+        return len(self.__states)
+
+    def clear(self):
+        with self.__lock:
+            self.__states.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def get(self, key):
+        with self.__lock:
+            state = self.__states.get(key)
+            if state is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.__states.move_to_end(key)
+            return state
+
+    @staticmethod
+    def key(lexicon, history):
+        return (lexicon.length, lexicon.version, tuple(map(tuple, history)))
+
+    def put(self, key, candidates, guesses=None):
+        state = SolverState(candidates, guesses)
+        with self.__lock:
+            self.__states[key] = state
+            self.__states.move_to_end(key)
+            while len(self.__states) > self.maxsize:
+                self.__states.popitem(last=False)
+                self.evictions += 1
+        return state
+
+    @property
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self.__states),
+            "maxsize": self.maxsize,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def save(self, path):
+        with self.__lock:
+            states = [
+                [length, version, history, state.candidates, state.guesses]
+                for (length, version, history), state in self.__states.items()
+            ]
+        write_json(path, {"version": FORMAT_VERSION, "states": states})
+        return path
+
+    @classmethod
+    def load(cls, path, maxsize=MAXSIZE):
+        with gzip.open(path, "rt", encoding="ascii") as cache_file:
+            data = json.load(cache_file)
+        if data.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a v{FORMAT_VERSION} solver cache")
+        cache = cls(maxsize)
+        for length, version, history, candidates, guesses in data["states"]:
+            cache.put(
+                (length, version, tuple(map(tuple, history))), candidates, guesses
+            )
+        return cache
@@ -0,0 +1,86 @@
+import collections
+from pathlib import Path
+
+
+def read_lines(path):
+    path = Path(path)
+    opener = open
+    if path.suffix == ".gz":
+        import gzip
+
+        opener = gzip.open
+    # Undecodable bytes become U+FFFD rather than vanishing, so normalize
+    # drops a word with any non-ASCII letter whole instead of losing the letter.
+    with opener(path, "rt", encoding="utf-8", errors="replace") as lines:
+        yield from lines
+
+
+def normalize(lines, weighted=False):
+    for line in lines:
+        word, weight = line.strip(), 1.0
+        if weighted:
+            word, *fields = word.split(None, 1) or ("",)
+            try:
+                weight = float(fields[0]) if fields else weight
+            except ValueError:
+                continue
+        word = word.upper()
+        if word and word.isascii() and word.isalpha():
+            yield word, weight
+
+
+def bucket_by_length(entries):
+    # Repeated words keep their heaviest weight; only one entry per distinct
+    # word is ever held, never the raw lines.
+    weights_by_length = collections.defaultdict(dict)
+    for word, weight in entries:
+        weights = weights_by_length[len(word)]
+        weights[word] = max(weights.get(word, weight), weight)
+    return weights_by_length
+
+
+class WordSource:
+    def __init__(self, path, weighted=False):
+        self.path = Path(path)
+        self.weighted = bool(weighted)
+
+    def __repr__(self):
+        return f"WordSource({str(self.path)!r}, weighted={self.weighted})"
+
+    def entries(self):
+        return normalize(read_lines(self.path), self.weighted)
+
+
+def as_source(source, weighted=False):
+    if source is None or isinstance(source, WordSource):
+        return source
+    return WordSource(source, weighted)
+
+
+def collect(guesses, answers=None):
+    # Answers are always valid guesses, so their words join the guess list and
+    # each length records which of its words may be the secret. An unweighted
+    # answer list only adds words; it never overrides the corpus weights.
+    guesses, answers = as_source(guesses), as_source(answers)
+    weights_by_length = bucket_by_length(guesses.entries())
+    answers_by_length = dict()
+    if answers is not None:
+        answers_by_length = bucket_by_length(answers.entries())
+        for length, answer_weights in answers_by_length.items():
+            weights = weights_by_length[length]
+            for word, weight in answer_weights.items():
+                if answers.weighted or word not in weights:
+                    weights[word] = max(weights.get(word, weight), weight)
+
+    weighted = guesses.weighted or (answers is not None and answers.weighted)
+    for length, weights in weights_by_length.items():
+        words = tuple(sorted(weights))
+        answer_indices = None
+        if answers is not None:
+            answer_words = answers_by_length.get(length, ())
+            answer_indices = tuple(
+                index for index, word in enumerate(words) if word in answer_words
+            )
+        yield length, words, answer_indices, (
+            tuple(weights[word] for word in words) if weighted else None
+        )
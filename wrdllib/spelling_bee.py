@@ -0,0 +1,120 @@
+import collections
+import threading
+
+from .constraints import BITS
+from .lexicon import LEXICON
+
+MINIMUM_LENGTH = 4
+PUZZLE_SIZE = 7
+
+
+def signature(letters):
+    return sum(map(BITS.__getitem__, set(letters)))
+
+
+def puzzle_signatures(letters, required_letter):
+    letters, required_letter = str(letters).upper(), str(required_letter).upper()
+    if (
+        len(set(letters)) != PUZZLE_SIZE
+        or not all(letter in BITS for letter in letters)
+        or len(required_letter) != 1
+        or required_letter not in letters
+    ):
+        raise ValueError(
+            f"a puzzle needs {PUZZLE_SIZE} distinct letters including the required one"
+        )
+    return signature(letters), BITS[required_letter]
+
+
+class SpellingBeeIndex:
+    def __init__(self, store=LEXICON, minimum_length=MINIMUM_LENGTH):
+        self.store = store
+        self.minimum_length = int(minimum_length)
+        self.__signatures = None
+        self.__pangrams = None
+        self.__lock = threading.Lock()
+
+    @property
+    def pangrams(self):
+        if self.__pangrams is None:
+            self.__pangrams = {
+                key: words
+                for key, words in self.signatures.items()
+                if bin(key).count("1") == PUZZLE_SIZE
+            }
+        return self.__pangrams
+
+    @property
+    def signatures(self):
+        if self.__signatures is None:
+            with self.__lock:
+                if self.__signatures is None:
+                    self.__signatures = self.build()
+        return self.__signatures
+
+    def build(self):
+        # Words with more distinct letters than a puzzle has can never be an
+        # answer, so only the (at most) seven-letter sets are indexed.
+        words_by_signature = collections.defaultdict(list)
+        for length in self.store.lengths:
+            if length < self.minimum_length:
+                continue
+            for word in self.store[length]:
+                letters = set(word)
+                if len(letters) <= PUZZLE_SIZE:
+                    words_by_signature[signature(letters)].append(word)
+        return {key: tuple(words) for key, words in words_by_signature.items()}
+
+    def matches(self, free_letters, required=0):
+        # Each subset of the free letters plus the required ones is one dict probe:
+        # 2**6 of them for a puzzle with its centre letter fixed.
+        signatures, subset = self.signatures, free_letters
+        while True:
+            key = subset | required
+            if key in signatures:
+                yield key, signatures[key]
+            if not subset:
+                break
+            subset = (subset - 1) & free_letters
+
+    def solve(self, letters, required_letter):
+        return self.solve_many([(letters, required_letter)])[0]
+
+    def solve_many(self, puzzles):
+        # Puzzles sharing a letter set (e.g. the same seven letters with each
+        # possible centre) enumerate its subsets once and split them by centre.
+        puzzles = [puzzle_signatures(*puzzle) for puzzle in puzzles]
+        centres = collections.defaultdict(set)
+        for letters, required in puzzles:
+            centres[letters].add(required)
+
+        solutions = dict()
+        for letters, required_letters in centres.items():
+            if len(required_letters) == 1:
+                (required,) = required_letters
+                matches = {required: self.matches(letters & ~required, required)}
+            else:
+                every_match = tuple(self.matches(letters))
+                matches = {
+                    required: [
+                        (key, words) for key, words in every_match if key & required
+                    ]
+                    for required in required_letters
+                }
+            for required, found in matches.items():
+                solutions[letters, required] = sorted(
+                    (word for _, words in found for word in words),
+                    key=lambda word: (-len(word), word),
+                )
+        return [solutions[puzzle] for puzzle in puzzles]
+
+
+def is_pangram(word, letters):
+    return set(str(letters).upper()) <= set(word)
+
+
+INDEX = SpellingBeeIndex()
+
+
+def solve(letters, required_letter):
+    return INDEX.solve(letters, required_letter)
@@ -0,0 +1,201 @@
+import collections
+import heapq
+from pathlib import Path
+import time
+
+BATCH_SIZE = 1000
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    played REAL NOT NULL,
+    length INTEGER NOT NULL,
+    secret TEXT,
+    guesses INTEGER NOT NULL,
+    won INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS summaries (
+    length INTEGER PRIMARY KEY,
+    games INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    streak INTEGER NOT NULL,
+    best_streak INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS distributions (
+    length INTEGER NOT NULL,
+    guesses INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (length, guesses)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS secrets (
+    length INTEGER NOT NULL,
+    secret TEXT NOT NULL,
+    games INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    guesses INTEGER NOT NULL,
+    PRIMARY KEY (length, secret)
+) WITHOUT ROWID;
+"""
+
+
+class GameStats:
+    def __init__(self):
+        self.games = 0
+        self.wins = 0
+        self.streak = 0
+        self.best_streak = 0
+        self.distribution = collections.Counter()
+        # Secret -> [games, wins, guesses], the guesses summed over the wins.
+        self.secrets = dict()
+
+    def break_streak(self):
+        self.streak = 0
+
+    def difficulty(self, secret):
+        games, wins, guesses = self.secrets.get(secret, (0, 0, 0))
+        return {
+            "games": games,
+            "win_rate": wins / games if games else 0.0,
+            "mean_guesses": guesses / wins if wins else 0.0,
+        }
+
+    def hardest(self, count=10):
+        return heapq.nsmallest(
+            int(count),
+            self.secrets,
+            key=lambda secret: (
+                self.secrets[secret][1] / self.secrets[secret][0],
+                -self.secrets[secret][2] / max(self.secrets[secret][1], 1),
+                secret,
+            ),
+        )
+
+    @property
+    def mean_guesses(self):
+        if not self.wins:
+            return 0.0
+        return sum(g * n for g, n in self.distribution.items()) / self.wins
+
+    def percentages(self, max_guesses):
+        return {
+            guesses: (
+                f"{round(self.distribution[guesses] / self.wins * 100, 1)}%"
+                if self.wins
+                else "0.0%"
+            )
+            for guesses in range(1, int(max_guesses) + 1)
+        }
+
+    def record(self, secret, guesses, won):
+        self.games += 1
+        if won:
+            self.wins += 1
+            self.streak += 1
+            self.best_streak = max(self.best_streak, self.streak)
+            self.distribution[guesses] += 1
+        else:
+            self.streak = 0
+        if secret is not None:
+            totals = self.secrets.setdefault(secret, [0, 0, 0])
+            totals[0] += 1
+            if won:
+                totals[1] += 1
+                totals[2] += guesses
+
+    @property
+    def win_rate(self):
+        return self.wins / self.games if self.games else 0.0
+
+
+class StatsStore:
+    def __init__(self, path, batch_size=BATCH_SIZE):
+        import sqlite3
+
+        self.path = Path(path)
+        self.batch_size = int(batch_size)
+        self.connection = sqlite3.connect(self.path)
+        # A write-ahead log with normal sync only reaches the disk at
+        # checkpoints, so a flushed batch costs no fsync of its own.
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.__pending = []
+        self.__dirty = collections.defaultdict(set)
+        self.__stats = self.load()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def break_streak(self, length):
+        self.stats(length).break_streak()
+        self.__dirty.setdefault(int(length), set())
+
+    def close(self):
+        self.flush()
+        self.connection.close()
+
+    def flush(self):
+        if not self.__pending and not self.__dirty:
+            return
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO games VALUES (?, ?, ?, ?, ?)", self.__pending
+            )
+            for length, secrets in self.__dirty.items():
+                stats = self.stats(length)
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?, ?)",
+                    (length, stats.games, stats.wins, stats.streak, stats.best_streak),
+                )
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO distributions VALUES (?, ?, ?)",
+                    ((length, g, n) for g, n in stats.distribution.items()),
+                )
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO secrets VALUES (?, ?, ?, ?, ?)",
+                    ((length, secret, *stats.secrets[secret]) for secret in secrets),
+                )
+        self.__pending.clear()
+        self.__dirty.clear()
+
+    def load(self):
+        # Only the aggregate tables are read back, so opening a store costs the
+        # same however many games it holds.
+        stats = collections.defaultdict(GameStats)
+        for length, games, wins, streak, best_streak in self.connection.execute(
+            "SELECT length, games, wins, streak, best_streak FROM summaries"
+        ):
+            summary = stats[length]
+            summary.games, summary.wins = games, wins
+            summary.streak, summary.best_streak = streak, best_streak
+        for length, guesses, count in self.connection.execute(
+            "SELECT length, guesses, count FROM distributions"
+        ):
+            stats[length].distribution[guesses] = count
+        for length, secret, games, wins, guesses in self.connection.execute(
+            "SELECT length, secret, games, wins, guesses FROM secrets"
+        ):
+            stats[length].secrets[secret] = [games, wins, guesses]
+        return stats
+
+    def record(self, length, secret, guesses, won):
+        length, guesses, won = int(length), int(guesses), bool(won)
+        self.stats(length).record(secret, guesses, won)
+        self.__pending.append((time.time(), length, secret, guesses, int(won)))
+        dirty = self.__dirty[length]
+        if secret is not None:
+            dirty.add(secret)
+        if len(self.__pending) >= self.batch_size:
+            self.flush()
+
+    def record_many(self, length, results, max_guesses=None):
+        # Unsolved games come back as None and are recorded as losses.
+        for secret, guesses in results:
+            won = guesses is not None and (
+                max_guesses is None or guesses <= max_guesses
+            )
+            self.record(length, secret, guesses or 0, won)
+
+    def stats(self, length):
+        return self.__stats[int(length)]
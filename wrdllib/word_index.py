@@ -0,0 +1,170 @@
+import argparse
+import collections
+import threading
+
+from .constraints import ALPHABET
+from .lexicon import LEXICON
+
+WILDCARDS = frozenset("?._")
+# The set bits of every byte value, so a posting decodes a byte at a time.
+BYTE_BITS = tuple(
+    tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256)
+)
+
+
+def bitset(indices, size):
+    bitmap = bytearray((size + 7) // 8)
+    for index in indices:
+        bitmap[index >> 3] |= 1 << (index & 7)
+    return int.from_bytes(bitmap, "little")
+
+
+def members(bits):
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+    return [
+        offset * 8 + bit
+        for offset, byte in enumerate(data)
+        if byte
+        for bit in BYTE_BITS[byte]
+    ]
+
+
+def parse_pattern(pattern):
+    pattern = str(pattern).upper().strip()
+    if not pattern or not all(
+        char in WILDCARDS or char in ALPHABET for char in pattern
+    ):
+        raise ValueError(
+            f"a pattern is letters and wildcards ({''.join(sorted(WILDCARDS))})"
+        )
+    return pattern
+
+
+def parse_letters(letters):
+    letters = str(letters).upper().strip()
+    if not all(char in ALPHABET for char in letters):
+        raise ValueError("letters must be A-Z only")
+    return letters
+
+
+class LengthIndex:
+    def __init__(self, words):
+        # Postings are bitsets over the lexicon's word indices: one per
+        # (position, letter), and one per (letter, copies) for words holding at
+        # least that many copies, so a query is a handful of big-int ANDs.
+        self.words = words
+        size = len(words)
+        self.every_word = (1 << size) - 1
+        positions = collections.defaultdict(list)
+        copies = collections.defaultdict(list)
+        anagrams = collections.defaultdict(list)
+        for index, word in enumerate(words):
+            seen = dict()
+            for position, letter in enumerate(word):
+                positions[position, letter].append(index)
+                seen[letter] = seen.get(letter, 0) + 1
+                copies[letter, seen[letter]].append(index)
+            anagrams["".join(sorted(word))].append(word)
+        self.positions = {key: bitset(found, size) for key, found in positions.items()}
+        self.copies = {key: bitset(found, size) for key, found in copies.items()}
+        self.anagrams = {key: tuple(found) for key, found in anagrams.items()}
+
+    def match(self, pattern, include="", exclude=""):
+        bits = self.every_word
+        for position, letter in enumerate(pattern):
+            if letter not in WILDCARDS:
+                bits &= self.positions.get((position, letter), 0)
+        for letter, count in collections.Counter(include).items():
+            bits &= self.copies.get((letter, count), 0)
+        for letter in set(exclude):
+            bits &= ~self.copies.get((letter, 1), 0)
+        return tuple(map(self.words.__getitem__, members(bits)))
+
+
+class WordIndex:
+    def __init__(self, store=LEXICON):
+        self.store = store
+        self.__lengths = dict()
+        self.__lock = threading.Lock()
+
+    def anagrams(self, letters):
+        letters = parse_letters(letters)
+        index = self.index(len(letters))
+        if index is None:
+            return ()
+        return index.anagrams.get("".join(sorted(letters)), ())
+
+    def index(self, length):
+        length = int(length)
+        if length not in self.__lengths:
+            with self.__lock:
+                if length not in self.__lengths:
+                    words = self.store[length]
+                    self.__lengths[length] = LengthIndex(words) if words else None
+        return self.__lengths[length]
+
+    def match(self, pattern, include="", exclude=""):
+        return self.query_many(
+            [{"pattern": pattern, "include": include, "exclude": exclude}]
+        )[0]
+
+    def query_many(self, queries):
+        # A batch resolves each distinct query once, so repeats and the same
+        # letters asked for in a different order cost a dict lookup.
+        queries = [self.normalize(query) for query in queries]
+        answers = dict()
+        for query in queries:
+            if query in answers:
+                continue
+            if query[0] == "anagram":
+                answers[query] = self.anagrams(query[1])
+                continue
+            _, pattern, include, exclude = query
+            index = self.index(len(pattern))
+            answers[query] = (
+                () if index is None else index.match(pattern, include, exclude)
+            )
+        return [answers[query] for query in queries]
+
+    @staticmethod
+    def normalize(query):
+        if "anagram" in query:
+            return ("anagram", "".join(sorted(parse_letters(query["anagram"]))))
+        return (
+            "match",
+            parse_pattern(query["pattern"]),
+            "".join(sorted(parse_letters(query.get("include", "")))),
+            "".join(sorted(set(parse_letters(query.get("exclude", ""))))),
+        )
+
+
+INDEX = WordIndex()
+
+
+def anagrams(letters):
+    return INDEX.anagrams(letters)
+
+
+def match(pattern, include="", exclude=""):
+    return INDEX.match(pattern, include, exclude)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    parser = argparse.ArgumentParser(
+        prog="python -m wrdllib.word_index",
+        description="Find words by pattern (e.g. C?A?T) or list anagrams.",
+    )
+    parser.add_argument("queries", nargs="+", help="patterns, or letters with -a")
+    parser.add_argument("-a", "--anagrams", action="store_true")
+    parser.add_argument("-i", "--include", default="", help="letters that must appear")
+    parser.add_argument("-x", "--exclude", default="", help="letters that must not")
+    args = parser.parse_args()
+    if args.anagrams:
+        batch = [{"anagram": letters} for letters in args.queries]
+    else:
+        batch = [
+            {"pattern": pattern, "include": args.include, "exclude": args.exclude}
+            for pattern in args.queries
+        ]
+    for query, words in zip(args.queries, INDEX.query_many(batch)):
+        print(f"{query.upper()}: {' '.join(words) if words else '(none)'}")
@@ -1,4 +1,3 @@
-import collections
 import os
 import time
 
@@ -11,7 +10,8 @@ from .exceptions import (
     NoSuchDictionary,
     OutOfGuesses,
 )
-from .guesses import GuessChecker
+from .guesses import STRATEGIES, GuessChecker, check_strategy
+from .stats import GameStats
 
 
 class Wrdl:
@@ -22,22 +22,64 @@ class Wrdl:
         None: " ",
     }
 
-    def __init__(self, length=5, max_guesses=6, force_starting_word=None, blind=False):
+    def __init__(
+        self,
+        length=5,
+        max_guesses=6,
+        force_starting_word=None,
+        blind=False,
+        engine="python",
+        strategy="best",
+        hard_mode=False,
+        adversarial=False,
+        store=None,
+        prefetch=False,
+        stats=None,
+        time_budget=None,
+        probe_words=False,
+        decision_tree=None,
+    ):
+        check_strategy(strategy)
         self.blind = bool(blind)
-        self.__completed_games = 0
         self.__max_guesses = max(int(max_guesses), 1)
-        self.__scores = list()
-        self.__streak = 0
-        self.checker = GuessChecker(length, force_starting_word)
+        self.stats_store = stats
+        self.strategy = strategy
+        self.checker = GuessChecker(
+            length,
+            force_starting_word,
+            engine=engine,
+            hard_mode=hard_mode,
+            adversarial=adversarial,
+            store=store,
+        )
         self.auto_solver = self.checker.auto_solver
+        # The solver is configured before any move is prefetched for it.
+        if time_budget is not None:
+            self.auto_solver.time_budget = float(time_budget)
+        # Probe words are inconsistent with the hints by design.
+        self.auto_solver.probe_words = bool(probe_words) and not hard_mode
+        self.auto_solver.decision_tree = decision_tree
+        self.__stats = (
+            GameStats()
+            if stats is None
+            else stats.stats(self.auto_solver.dictionary.length)
+        )
+        self.prefetcher = None
+        if prefetch:
+            from .prefetch import Prefetcher
+
+            self.prefetcher = Prefetcher(self.auto_solver)
+            self.prefetch()
 
-    def auto_guess(self, best_guess=True, random_guess=False):
+    def auto_guess(self, best_guess=True, random_guess=False, entropy_guess=False):
         try:
             self.enter_guess(
-                self.auto_solver.generate_guess(
-                    self.checker.guessed_letters,
-                    best_guess=best_guess,
-                    random_guess=random_guess,
+                self.hint(
+                    {
+                        "best_guess": best_guess,
+                        "random_guess": random_guess,
+                        "entropy_guess": entropy_guess,
+                    }
                 )
             )
         except ImpossibleSolution as e:  # pragma: no cover
@@ -56,9 +98,11 @@ class Wrdl:
             f"Playing Wrdl:\nYou have {self.max_guesses} guesses to find a "
             f"{self.auto_solver.dictionary.length}-letter word.\n"
         )
-        for i, guess in enumerate(self.checker.valid_guesses):
+        for guess, evaluations in zip(
+            self.checker.valid_guesses, self.checker.evaluations
+        ):
             print(ANSI.BOLD, end="")
-            for grade, letter in zip(self.checker.evaluate(i), guess):
+            for grade, letter in zip(evaluations, guess):
                 print(f"[{self.MARKERS[grade]}{letter}{ANSI.WHITE} ]", end="")
             print()
         for _ in range(self.max_guesses - len(self.checker.valid_guesses)):
@@ -85,6 +129,7 @@ class Wrdl:
                     f"Enter a {self.auto_solver.dictionary.length}-letter guess: "
                 )
             guess = self.checker.validate(guess)
+            self.prefetch()
             print()
         except (AlreadyGuessed, InvalidGuess) as message:
             if self.blind:
@@ -101,16 +146,38 @@ class Wrdl:
         else:
             self.draw()
 
+    def hint(self, modes=None):
+        # A move prefetched for this exact state is returned as soon as it is
+        # ready; anything else is worked out here and now.
+        modes = self.modes if modes is None else modes
+        guess = None
+        if self.prefetcher is not None:
+            guess = self.prefetcher.result(self.auto_solver.history, modes)
+        if guess is None:
+            guess = self.auto_solver.generate_guess(
+                self.checker.guessed_letters, **modes
+            )
+        return guess
+
+    @property
+    def modes(self):
+        return {
+            "best_guess": False,
+            "random_guess": False,
+            "entropy_guess": False,
+            **STRATEGIES[self.strategy],
+        }
+
     def play(self, demo=True, simulations=1):  # pragma: no cover
         for iteration in range(simulations if demo else 1):
             if self.checker.valid_guesses:
-                self.checker.reset()
+                self.reset()
             self.draw()
             while not self.solved:
                 try:
                     if demo:
                         time.sleep(3)
-                        self.auto_guess()
+                        self.auto_guess(**self.modes)
                     else:
                         self.enter_guess()
                 except GameOver as message:
@@ -119,6 +186,12 @@ class Wrdl:
         if not demo:
             self.play_again()
 
+    def prefetch(self):
+        if self.prefetcher is not None and not self.solved:
+            self.prefetcher.submit(
+                self.auto_solver.history, self.checker.guessed_letters, self.modes
+            )
+
     def play_again(self):  # pragma: no cover
         again = input("Play again? (Y/n) - ").upper()
         if again == "N":
@@ -126,29 +199,44 @@ class Wrdl:
         else:
             self.play()
 
+    def record(self, won):
+        length = self.auto_solver.dictionary.length
+        secret = self.checker.session.secret_word
+        guesses = len(self.checker.valid_guesses)
+        if self.stats_store is None:
+            self.__stats.record(secret, guesses, won)
+        else:
+            self.stats_store.record(length, secret, guesses, won)
+
     def you_lose(self, message):
-        self.__streak = 0
-        self.__completed_games += 1
+        self.record(won=False)
         self.draw()
         print(message)
         raise GameOver(message)
 
     def you_quit(self):
         message = "\nThe game was terminated early."
-        self.__streak = 0
+        if self.stats_store is None:
+            self.__stats.break_streak()
+        else:
+            self.stats_store.break_streak(self.auto_solver.dictionary.length)
         raise GameOver(message)
 
     def you_win(self):
-        self.__streak += 1
-        self.__completed_games += 1
-        self.__scores.append(len(self.checker.valid_guesses))
+        self.record(won=True)
         self.draw()
         print(f"{ANSI.BOLD}{self.checker.win_message}")
         self.stats()
 
+    def reset(self, force_starting_word=None):
+        if self.prefetcher is not None:
+            self.prefetcher.cancel()
+        self.checker.reset(force_starting_word)
+        self.prefetch()
+
     @property
     def completed_games(self):
-        return self.__completed_games
+        return self.__stats.games
 
     @property
     def max_guesses(self):
@@ -156,12 +244,7 @@ class Wrdl:
 
     @property
     def scores(self):
-        score_counts = collections.Counter(self.__scores)
-
-        def percent(s):
-            return f"{round((score_counts[s] / len(self.__scores)) * 100, 1)}%"
-
-        return {s: percent(s) for s in range(1, 7)}
+        return self.__stats.percentages(self.max_guesses)
 
     @property
     def solved(self):
@@ -172,18 +255,13 @@ class Wrdl:
 
     def stats(self):
         print("Total games played:", self.completed_games)
-        print("Longest win streak:", self.streak)
+        print("Longest win streak:", self.__stats.best_streak)
         if self.completed_games:
-            print(
-                "Win Rate:",
-                f"{round((len(self.__scores) / self.completed_games) * 100, 1)}%",
-            )
-        if self.scores:
-            print()
-            scores = self.scores
-            for score in range(1, 7):
-                print(f"{score}: {self.scores[score]}")
+            print("Win Rate:", f"{round(self.__stats.win_rate * 100, 1)}%")
+        print()
+        for score, percent in self.scores.items():
+            print(f"{score}: {percent}")
 
     @property
     def streak(self):
-        return self.__streak
+        return self.__stats.streak